@@ -0,0 +1,238 @@
+# spotlight_gui/_entry.py
+import asyncio
+import logging
+import sys
+import os
+import traceback
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from spotlight_gui.utils.checks import is_macos
+
+log = logging.getLogger(__name__)
+
+def _cancel_all_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Cancels every pending task on `loop` and waits for them to unwind,
+    then finalizes async generators. Mirrors the teardown done by asyncio.run().
+    Does nothing beyond requesting cancellation if the loop is still running.
+    """
+    tasks = [task for task in asyncio.all_tasks(loop) if not task.done()]
+    for task in tasks:
+        task.cancel()
+    log.debug("Cancelled %d pending tasks.", len(tasks))
+
+    if loop.is_running():
+        return
+
+    if tasks:
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        for task in tasks:
+            if not task.cancelled() and task.exception() is not None:
+                loop.call_exception_handler({
+                    'message': 'unhandled exception during GUI shutdown',
+                    'exception': task.exception(),
+                    'task': task,
+                })
+    loop.run_until_complete(loop.shutdown_asyncgens())
+
+def _new_qtasyncio_loop() -> asyncio.AbstractEventLoop | None:
+    """
+    Returns an event loop from PySide6.QtAsyncio (PySide6 >= 6.6) that runs on
+    the Qt main loop, or None if QtAsyncio is not available.
+    Must be called after the QApplication has been created.
+    """
+    try:
+        from PySide6.QtAsyncio import QAsyncioEventLoopPolicy
+    except ImportError:
+        return None
+    policy = QAsyncioEventLoopPolicy()
+    asyncio.set_event_loop_policy(policy)
+    return policy.new_event_loop()
+
+def _new_qasync_loop(app) -> asyncio.AbstractEventLoop | None:
+    """
+    Returns a qasync event loop running on the Qt main loop of `app`, or
+    None if qasync is not installed. Used where QtAsyncio is unavailable
+    (PyQt5, or PySide6 older than 6.6).
+    """
+    try:
+        import qasync
+    except ImportError:
+        return None
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    return loop
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Creates an asyncio loop and makes it current for the main thread.
+    Uses uvloop when it is installed, which speeds up the subprocess pipe
+    reads behind mdfind and log streaming; otherwise a standard asyncio loop.
+    """
+    log.debug("Initializing asyncio event loop...")
+    try:
+        import uvloop
+    except ImportError:
+        loop = asyncio.new_event_loop()
+    else:
+        log.debug("Using uvloop event loop.")
+        loop = uvloop.new_event_loop()
+    asyncio.set_event_loop(loop)
+    return loop
+
+class _Backend(NamedTuple):
+    """A constructed GUI backend, ready to be shown and run."""
+    show: Callable[[], None]            # Makes the main window visible.
+    run: Callable[[], Optional[int]]    # Enters the GUI main loop; returns an exit code or None.
+    loop: asyncio.AbstractEventLoop     # The asyncio loop the backend created for itself.
+
+# A launcher builds one GUI backend. Launchers raise ImportError when their
+# toolkit is not installed.
+Launcher = Callable[[], _Backend]
+
+def _single_thread_backend(gui_app, loop: asyncio.AbstractEventLoop) -> _Backend:
+    """Wraps a window whose asyncio loop is driven by the Qt event loop."""
+    def _run() -> int:
+        # The Qt-integrated loop's run_forever() drives QApplication.exec() itself.
+        loop.run_forever()
+        return 0
+    return _Backend(gui_app.show, _run, loop)
+
+def _launch_pyside6() -> _Backend:
+    from PySide6.QtWidgets import QApplication
+
+    app_instance = QApplication(sys.argv)
+    # Prefer the native Qt-driven loop so asyncio callbacks run on the
+    # Qt event loop instead of a separate worker thread.
+    qt_loop = _new_qtasyncio_loop()
+    from spotlight_gui.ui.qt_app import SpotlightQtApp
+    if qt_loop is None:
+        return _launch_qt_fallback(app_instance, SpotlightQtApp)
+
+    try:
+        gui_app = SpotlightQtApp(qt_loop, run_loop_in_thread=False)
+    except Exception:
+        qt_loop.close()
+        asyncio.set_event_loop_policy(None)
+        raise
+    log.debug("Using PySide6.QtAsyncio event loop.")
+    asyncio.set_event_loop(qt_loop)
+    return _single_thread_backend(gui_app, qt_loop)
+
+def _launch_qt_fallback(app_instance, window_class) -> _Backend:
+    """
+    Builds the Qt window on a qasync loop when qasync is installed, so
+    coroutines run on the GUI thread; otherwise on an asyncio loop in an
+    AsyncWorker thread.
+    """
+    qasync_loop = _new_qasync_loop(app_instance)
+    if qasync_loop is not None:
+        try:
+            gui_app = window_class(qasync_loop, run_loop_in_thread=False)
+        except Exception:
+            qasync_loop.close()
+            raise
+        log.debug("Using qasync event loop.")
+        return _single_thread_backend(gui_app, qasync_loop)
+
+    loop = _new_event_loop()
+    try:
+        gui_app = window_class(loop)
+    except Exception:
+        loop.close()
+        raise
+    return _Backend(gui_app.show, app_instance.exec, loop)
+
+def _launch_pyqt5() -> _Backend:
+    from PyQt5.QtWidgets import QApplication
+
+    app_instance = QApplication(sys.argv)
+    from spotlight_gui.ui.qt_app import SpotlightQtApp
+    return _launch_qt_fallback(app_instance, SpotlightQtApp)
+
+def _launch_tk() -> _Backend:
+    import tkinter # noqa: F401 - raises ImportError early if Tk is missing
+    from spotlight_gui.ui.tk_app import TkinterApp
+
+    # Tk polls this loop from its own mainloop (see TkinterApp._poll_asyncio).
+    loop = _new_event_loop()
+    try:
+        gui_app = TkinterApp(loop) # This is the Tk() root instance
+    except Exception:
+        loop.close()
+        raise
+    # The Tk root window is already visible once constructed.
+    return _Backend(lambda: None, gui_app.mainloop, loop)
+
+# Backends in order of preference: Qt if available, otherwise Tkinter.
+BACKENDS: List[Tuple[str, Launcher]] = [
+    ("PySide6", _launch_pyside6),
+    ("PyQt5", _launch_pyqt5),
+    ("Tkinter", _launch_tk),
+]
+
+def _shutdown_loop(loop: asyncio.AbstractEventLoop | None) -> None:
+    """Cancels outstanding work on `loop` and closes it."""
+    log.debug("Cleaning up asyncio event loop...")
+    if loop is not None and not loop.is_closed():
+        try:
+            _cancel_all_tasks(loop)
+        except RuntimeError as e:
+            print(f"WARNING: Error during task cleanup, loop might be closed: {e}", file=sys.stderr)
+
+        if not loop.is_running():
+            loop.close()
+        log.debug("Asyncio loop closed.")
+
+    print("Application finished.")
+
+def run_gui():
+    """
+    Main entry point for the Spotlight GUI application.
+    Selects and runs the appropriate GUI backend (Qt or Tkinter).
+    """
+    # Debug output is opt-in via SPOTLIGHT_DEBUG; log.debug is a no-op otherwise.
+    logging.basicConfig(level=logging.DEBUG if os.environ.get('SPOTLIGHT_DEBUG') else logging.WARNING)
+    log.debug("Platform: %s, is_macos: %s", sys.platform, is_macos())
+    if not is_macos():
+        print("WARNING: This application is designed for macOS and relies on macOS-specific tools (mdfind, mdutil, mdls, log).")
+        print("Functionality may be limited or fail on non-macOS systems.")
+
+    # Each launcher creates the event loop it needs, so no loop is allocated
+    # for backends that are never used.
+    backend = None
+    for name, launcher in BACKENDS:
+        log.debug("Attempting to launch %s GUI...", name)
+        try:
+            backend = launcher()
+        except ImportError as e:
+            log.debug("%s is not available: %s", name, e)
+            continue
+        except Exception as e:
+            print(f"ERROR: Failed to launch {name} GUI: {e}", file=sys.stderr)
+            traceback.print_exc()
+            continue
+        log.debug("%s GUI launched successfully.", name)
+        break
+
+    if backend is None:
+        print("FATAL: No suitable GUI backend found. Please install PySide6 or ensure Tkinter is properly installed.", file=sys.stderr)
+        sys.exit(1)
+
+    # Only showing the window is guarded; the (long-running) main loop itself
+    # runs outside any except handler, with cleanup guaranteed by `finally`.
+    try:
+        backend.show()
+    except Exception as e:
+        print(f"An unhandled error occurred while showing the GUI: {e}", file=sys.stderr)
+        traceback.print_exc()
+        _shutdown_loop(backend.loop)
+        sys.exit(1)
+
+    try:
+        log.debug("Entering GUI main loop...")
+        return_code = backend.run()
+    finally:
+        _shutdown_loop(backend.loop)
+    if return_code is not None:
+        sys.exit(return_code)
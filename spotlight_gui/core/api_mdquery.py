@@ -0,0 +1,172 @@
+# spotlight_gui/core/api_mdquery.py
+"""
+Runs one-shot Spotlight queries in-process through the MDQuery C API
+(CoreServices.framework) via ctypes, avoiding an mdfind fork/exec per search.
+
+Only raw Spotlight query syntax is handled here (e.g. 'kMDItemFSName == "*.txt"');
+mdfind additionally expands plain words into a query, so query_paths()
+returns None for strings MDQuery cannot parse and callers fall back to mdfind.
+"""
+import ctypes
+import os
+import threading
+import time
+from typing import List, Optional
+
+from spotlight_gui.utils.checks import IS_MACOS
+
+_CF_PATH = '/System/Library/Frameworks/CoreFoundation.framework/CoreFoundation'
+_CS_PATH = '/System/Library/Frameworks/CoreServices.framework/CoreServices'
+
+_kCFStringEncodingUTF8 = 0x08000100
+_kMDQueryAsynchronous = 0  # No kMDQueryWantsUpdates: stop once gathering is complete
+# How long each run-loop turn may wait before the stop event and deadline are re-checked.
+_POLL_INTERVAL = 0.05
+_kCFRunLoopRunFinished = 1
+
+_cf = None
+_cs = None
+if IS_MACOS:
+    try:
+        # Loaded by absolute path: on macOS 11+ the frameworks live in the
+        # dyld shared cache and are not found by ctypes.util.find_library().
+        _cf = ctypes.CDLL(_CF_PATH)
+        _cs = ctypes.CDLL(_CS_PATH)
+    except OSError as e:
+        print(f"Warning: could not load CoreServices, in-process Spotlight queries are disabled: {e}")
+        _cf = _cs = None
+
+if _cs is not None:
+    _CFIndex = ctypes.c_long
+    _cf.CFRelease.argtypes = [ctypes.c_void_p]
+    _cf.CFRelease.restype = None
+    _cf.CFStringCreateWithCString.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_uint32]
+    _cf.CFStringCreateWithCString.restype = ctypes.c_void_p
+    _cf.CFStringGetLength.argtypes = [ctypes.c_void_p]
+    _cf.CFStringGetLength.restype = _CFIndex
+    _cf.CFStringGetMaximumSizeForEncoding.argtypes = [_CFIndex, ctypes.c_uint32]
+    _cf.CFStringGetMaximumSizeForEncoding.restype = _CFIndex
+    _cf.CFStringGetCString.argtypes = [ctypes.c_void_p, ctypes.c_char_p, _CFIndex, ctypes.c_uint32]
+    _cf.CFStringGetCString.restype = ctypes.c_bool
+    _cf.CFArrayCreate.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_void_p), _CFIndex, ctypes.c_void_p]
+    _cf.CFArrayCreate.restype = ctypes.c_void_p
+    _cf.CFRunLoopRunInMode.argtypes = [ctypes.c_void_p, ctypes.c_double, ctypes.c_bool]
+    _cf.CFRunLoopRunInMode.restype = ctypes.c_int32
+
+    _cs.MDQueryCreate.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
+    _cs.MDQueryCreate.restype = ctypes.c_void_p
+    _cs.MDQuerySetSearchScope.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint32]
+    _cs.MDQuerySetSearchScope.restype = None
+    _cs.MDQueryExecute.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+    _cs.MDQueryExecute.restype = ctypes.c_bool
+    _cs.MDQueryIsGatheringComplete.argtypes = [ctypes.c_void_p]
+    _cs.MDQueryIsGatheringComplete.restype = ctypes.c_bool
+    _cs.MDQueryStop.argtypes = [ctypes.c_void_p]
+    _cs.MDQueryStop.restype = None
+    _cs.MDQueryGetResultCount.argtypes = [ctypes.c_void_p]
+    _cs.MDQueryGetResultCount.restype = _CFIndex
+    _cs.MDQueryGetResultAtIndex.argtypes = [ctypes.c_void_p, _CFIndex]
+    _cs.MDQueryGetResultAtIndex.restype = ctypes.c_void_p
+    _cs.MDItemCopyAttribute.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+    _cs.MDItemCopyAttribute.restype = ctypes.c_void_p
+
+    _kCFTypeArrayCallBacks = ctypes.addressof(ctypes.c_void_p.in_dll(_cf, 'kCFTypeArrayCallBacks'))
+    _kMDItemPath = ctypes.c_void_p.in_dll(_cs, 'kMDItemPath').value
+    _kCFRunLoopDefaultMode = ctypes.c_void_p.in_dll(_cf, 'kCFRunLoopDefaultMode').value
+
+MDQUERY_AVAILABLE = _cs is not None
+
+def _cfstring(value: str) -> int:
+    """Creates a CFStringRef from a Python string; the caller must CFRelease it."""
+    return _cf.CFStringCreateWithCString(None, os.fsencode(value), _kCFStringEncodingUTF8)
+
+def _cfstring_to_str(ref: int) -> str:
+    """Converts a CFStringRef to a Python string."""
+    size = _cf.CFStringGetMaximumSizeForEncoding(_cf.CFStringGetLength(ref), _kCFStringEncodingUTF8) + 1
+    buffer = ctypes.create_string_buffer(size)
+    if not _cf.CFStringGetCString(ref, buffer, size, _kCFStringEncodingUTF8):
+        return ''
+    return buffer.value.decode('utf-8', errors='surrogateescape')
+
+def query_paths(query: str, paths: Optional[List[str]] = None, timeout: Optional[float] = None,
+                stop: Optional[threading.Event] = None) -> Optional[List[str]]:
+    """
+    Runs a Spotlight query to completion and returns the paths of the matches.
+    Blocks until Spotlight has gathered every result, so call it from a worker
+    thread when on an event loop. The query is executed asynchronously on this
+    thread's run loop, so it can be stopped part-way.
+
+    Args:
+        query: A Spotlight query in MDQuery syntax.
+        paths: Directories to limit the search to, like `mdfind -onlyin`.
+        timeout: Seconds to let Spotlight gather results before giving up.
+        stop: Set from another thread to abandon the query early.
+
+    Returns:
+        The matching file paths, or None if the query is not valid MDQuery
+        syntax, could not be run, timed out or was stopped (the caller should
+        fall back to mdfind, or drop the search).
+
+    Raises:
+        RuntimeError: If the MDQuery API is not available.
+    """
+    if not MDQUERY_AVAILABLE:
+        raise RuntimeError("The Spotlight MDQuery API is not available on this system.")
+
+    owned = []  # CF objects to release once the query is done
+    try:
+        query_string = _cfstring(query)
+        if not query_string:
+            return None
+        owned.append(query_string)
+        md_query = _cs.MDQueryCreate(None, query_string, None, None)
+        if not md_query:
+            return None  # Not valid MDQuery syntax
+        owned.append(md_query)
+
+        if paths:
+            scope_items = [_cfstring(path) for path in paths]
+            owned.extend(item for item in scope_items if item)
+            if not all(scope_items):
+                return None  # A NULL array element would crash CoreServices
+            scope_array = (ctypes.c_void_p * len(scope_items))(*scope_items)
+            scope = _cf.CFArrayCreate(None, scope_array, len(scope_items), _kCFTypeArrayCallBacks)
+            if not scope:
+                return None
+            owned.append(scope)
+            _cs.MDQuerySetSearchScope(md_query, scope, 0)
+
+        if not _cs.MDQueryExecute(md_query, _kMDQueryAsynchronous):
+            return None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not _cs.MDQueryIsGatheringComplete(md_query):
+            if (stop is not None and stop.is_set()) or (deadline is not None and time.monotonic() >= deadline):
+                _cs.MDQueryStop(md_query)
+                return None
+            if _cf.CFRunLoopRunInMode(_kCFRunLoopDefaultMode, _POLL_INTERVAL, True) == _kCFRunLoopRunFinished:
+                time.sleep(_POLL_INTERVAL)  # No run-loop sources yet; don't spin
+        _cs.MDQueryStop(md_query)
+
+        results: List[str] = []
+        for index in range(_cs.MDQueryGetResultCount(md_query)):
+            item = _cs.MDQueryGetResultAtIndex(md_query, index)  # Not owned
+            if not item:
+                continue
+            path_ref = _cs.MDItemCopyAttribute(item, _kMDItemPath)
+            if path_ref:
+                results.append(_cfstring_to_str(path_ref))
+                _cf.CFRelease(path_ref)
+        return results
+    finally:
+        for ref in reversed(owned):
+            _cf.CFRelease(ref)
+
+# Simple test stub for api_mdquery.py
+if __name__ == '__main__':
+    print("--- Testing api_mdquery.py ---")
+    if MDQUERY_AVAILABLE:
+        found = query_paths('kMDItemFSName == "*.app"', ['/Applications'])
+        print(f"Found {len(found or [])} applications; first few: {(found or [])[:5]}")
+        print(f"Plain-word query (expected None): {query_paths('hello world')}")
+    else:
+        print("MDQuery API is NOT available. Skipping MDQuery-specific tests.")
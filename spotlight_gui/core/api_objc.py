@@ -1,88 +1,114 @@
 # spotlight_gui/core/api_objc.py
 import sys
 import os # Added for os.path.exists
+import importlib.util
+import functools
 from typing import Dict, Any, List
 
-from spotlight_gui.utils.checks import check_pyobjc_available, is_macos
+from spotlight_gui.utils.checks import check_pyobjc_available, IS_MACOS
 
+# The AppKit bridge is expensive to load, so only check that it is installed
+# here. The actual import happens when a PyObjCHelper is first constructed.
 _pyobjc_available = False
-if is_macos():
+if IS_MACOS:
     _pyobjc_available = check_pyobjc_available()
     if _pyobjc_available:
-        try:
-            from Foundation import NSURL, NSString # type: ignore
-            from AppKit import NSWorkspace # type: ignore
-            # Import other necessary Cocoa frameworks/classes
-        except ImportError as e:
+        if importlib.util.find_spec("AppKit") is None:
             _pyobjc_available = False
-            print(f"Warning: PyObjC detected but could not import necessary frameworks: {e}")
+            print("Warning: PyObjC detected but the AppKit framework bridge is not installed.")
     else:
         print("PyObjC is not installed or not available. api_objc features will be disabled.")
 else:
     print("Not on macOS. PyObjC is not available. api_objc features will be disabled.")
 
-class PyObjCHelper:
-    """
-    Provides optional PyObjC-based helper functions for Spotlight metadata.
-    This class is instantiated only if PyObjC is successfully imported.
-    """
-    def __init__(self):
-        if not _pyobjc_available:
-            raise RuntimeError("PyObjCHelper initialized but PyObjC is not available.")
-        print("PyObjCHelper initialized successfully.")
-
-    def file_info(self, file_path: str) -> Dict[str, Any]:
-        """
-        Retrieves basic file information and checks for icon availability using PyObjC.
-        This demonstrates PyObjC integration, rather than being a full mdls replacement.
+# The implementation is chosen once at import, so file_info never has to
+# re-check PyObjC availability per call.
+if _pyobjc_available:
+    # The shared NSWorkspace, fetched once by the first PyObjCHelper().
+    _workspace = None
 
-        Args:
-            file_path: The path to the file.
+    @functools.lru_cache(maxsize=4096)
+    def _has_icon(file_path: str) -> bool:
+        """Returns whether NSWorkspace has an icon for `file_path`, memoized per path."""
+        return _workspace.iconForFile_(file_path) is not None
 
-        Returns:
-            A dictionary with file existence, path, and icon availability.
+    class PyObjCHelper:
         """
-        if not _pyobjc_available:
-            return {"exists": os.path.exists(file_path), "path": file_path, "has_icon": False, "status": "PyObjC not available"}
-
-        info: Dict[str, Any] = {"exists": os.path.exists(file_path), "path": file_path}
+        Provides optional PyObjC-based helper functions for Spotlight metadata.
+        This class is only defined when PyObjC is available.
+        """
+        def __init__(self):
+            try:
+                from AppKit import NSWorkspace # type: ignore
+            except ImportError as e:
+                raise RuntimeError(f"PyObjC detected but could not import necessary frameworks: {e}")
+            # Cache the shared workspace so icon lookups do not cross the bridge for it on every call.
+            global _workspace
+            if _workspace is None:
+                _workspace = NSWorkspace.sharedWorkspace()
+            print("PyObjCHelper initialized successfully.")
+
+        def file_info(self, file_path: str) -> Dict[str, Any]:
+            """
+            Retrieves basic file information and checks for icon availability using PyObjC.
+            This demonstrates PyObjC integration, rather than being a full mdls replacement.
+            Assumes construction succeeded, i.e. the AppKit bridge is loaded.
+
+            Args:
+                file_path: The path to the file.
+
+            Returns:
+                A dictionary with file existence, path, and icon availability.
+            """
+            # A single stat() answers "exists"; the icon lookup below is skipped
+            # entirely for missing files.
+            try:
+                os.stat(file_path)
+                exists = True
+            except OSError:
+                exists = False
+            info: Dict[str, Any] = {"exists": exists, "path": file_path}
+
+            if not exists:
+                info["has_icon"] = False
+                info["status"] = "File not found"
+                return info
+
+            try:
+                # NSWorkspace.sharedWorkspace().iconForFile_() can fetch icons
+                # It returns an NSImage object. Converting this to a Qt/Tkinter image
+                # would require more complex bridging (e.g., converting to TIFF data).
+                # For this example, we just check if an icon exists.
+                info["has_icon"] = _has_icon(file_path)
+                info["status"] = "Active"
+            except Exception as e:
+                info["has_icon"] = False
+                info["status"] = f"Error fetching icon: {e}"
+                print(f"Error in PyObjCHelper.file_info: {e}")
 
-        if not info["exists"]:
-            info["has_icon"] = False
-            info["status"] = "File not found"
             return info
+else:
+    class PyObjCHelper:
+        """
+        Stand-in used when PyObjC is unavailable. Reports file existence only
+        and never touches the Objective-C bridge.
+        """
+        def file_info(self, file_path: str) -> Dict[str, Any]:
+            return {"exists": os.path.exists(file_path), "path": file_path, "has_icon": False, "status": "PyObjC not available"}
 
-        try:
-            # NSWorkspace.sharedWorkspace().iconForFile_() can fetch icons
-            # It returns an NSImage object. Converting this to a Qt/Tkinter image
-            # would require more complex bridging (e.g., converting to TIFF data).
-            # For this example, we just check if an icon exists.
-            ws = NSWorkspace.sharedWorkspace()
-            icon = ws.iconForFile_(file_path)
-            info["has_icon"] = (icon is not None)
-            info["status"] = "Active"
-        except Exception as e:
-            info["has_icon"] = False
-            info["status"] = f"Error fetching icon: {e}"
-            print(f"Error in PyObjCHelper.file_info: {e}")
-        
-        return info
-
-_pyobjc_helper_instance: PyObjCHelper | None = None
-
+@functools.cache
 def get_pyobjc_helper() -> PyObjCHelper | None:
     """
     Returns the PyObjCHelper instance if PyObjC is available, otherwise None.
-    Initializes the helper on first call if available.
+    The helper is created on the first call; later calls return the cached result.
     """
-    global _pyobjc_helper_instance
-    if _pyobjc_helper_instance is None and _pyobjc_available:
-        try:
-            _pyobjc_helper_instance = PyObjCHelper()
-        except RuntimeError as e:
-            print(f"Failed to initialize PyObjCHelper: {e}")
-            _pyobjc_helper_instance = None # Ensure it's None if init fails
-    return _pyobjc_helper_instance
+    if not _pyobjc_available:
+        return None
+    try:
+        return PyObjCHelper()
+    except RuntimeError as e:
+        print(f"Failed to initialize PyObjCHelper: {e}")
+        return None
 
 # Simple test stub for api_objc.py
 if __name__ == '__main__':
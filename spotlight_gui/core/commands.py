@@ -1,27 +1,315 @@
 # spotlight_gui/core/commands.py
 import asyncio
-import json
-import plistlib
+import base64
+import collections
+import datetime
+import functools
+import inspect
 import os
+import re
 import sys
-from typing import List, Dict, Any, Callable, AsyncGenerator, Union
+import threading
+import time
+import types
+from typing import List, Dict, Any, Callable, AsyncGenerator, Mapping, Optional, Union
 
+# lxml (libxml2) parses XML plists considerably faster than plistlib's
+# expat-based parser. It is optional; plistlib is used when it is missing.
+try:
+    from lxml import etree as _lxml_etree
+except ImportError:
+    _lxml_etree = None
+
+# orjson serializes the volume list several times faster than the json module.
+# It is optional; json is used when it is missing.
+try:
+    import orjson as _json_fast
+except ImportError:
+    _json_fast = None
+
+from spotlight_gui.utils import async_subprocess
 from spotlight_gui.utils.async_subprocess import run_command_async, run_streaming_command_async, get_recent_output_logs
-from spotlight_gui.utils.checks import enforce_volume_protection_rule, SystemCheckError, is_macos
+from spotlight_gui.utils.checks import (enforce_volume_protection_rule, enforce_volume_protection_rule_many,
+                                        SystemCheckError, IS_MACOS)
 
-if not is_macos():
+if not IS_MACOS:
     print("Warning: spotlight_gui.core.commands is designed for macOS. Functionality may be limited or fail on other platforms.")
 
+@functools.lru_cache(maxsize=4096)
+def _check_path(path: str) -> None:
+    """
+    enforce_volume_protection_rule() with results memoized per path string.
+    Allowed paths (such as '/' on every status refresh) are cached; forbidden
+    paths raise and are therefore re-checked each time. Call
+    _check_path.cache_clear() if the protection rule is changed at runtime.
+    """
+    enforce_volume_protection_rule(path)
+
 class CommandError(Exception):
     """Custom exception for errors originating from command execution."""
     def __init__(self, message: str, return_code: int = None, stdout: str = None, stderr: str = None):
         super().__init__(message)
+        self.message = message
         self.return_code = return_code
         self.stdout = stdout
         self.stderr = stderr
 
+# Streamed lines are handed to output callbacks in batches of up to this many
+# lines, or after this many seconds, whichever comes first.
+_STREAM_BATCH_SIZE = 128
+_STREAM_BATCH_INTERVAL = 0.05
+
+class _LineBatcher:
+    """
+    Coalesces streamed output lines and passes them to a callback as a list.
+
+    Coroutine callbacks are awaited and plain callables are called inline on
+    the event loop; only when `blocking` is True is each batch run in a
+    worker thread via asyncio.to_thread.
+    """
+    def __init__(self, callback: Callable[[List[str]], Any], blocking: bool = False,
+                 max_lines: int = _STREAM_BATCH_SIZE, max_delay: float = _STREAM_BATCH_INTERVAL):
+        self._callback = callback
+        self._is_coroutine = inspect.iscoroutinefunction(callback)
+        self._blocking = blocking
+        self._max_lines = max_lines
+        self._max_delay = max_delay
+        self._batch: List[str] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._dispatch_lock = asyncio.Lock()  # Keeps batches in stream order
+
+    async def add(self, line: str):
+        if not line:
+            return
+        self._batch.append(line)
+        if len(self._batch) >= self._max_lines:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self._max_delay)
+        self._timer = None
+        await self._dispatch()
+
+    async def flush(self):
+        """Sends any buffered lines to the callback immediately."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self._dispatch()
+
+    async def _dispatch(self):
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        async with self._dispatch_lock:
+            if self._is_coroutine:
+                await self._callback(batch)
+            elif self._blocking:
+                await asyncio.to_thread(self._callback, batch)
+            else:
+                self._callback(batch)
+
+def _per_line(callback: Callable[[str], Any]) -> Callable[[List[str]], Any]:
+    """Adapts a per-line output callback to the batch interface of _LineBatcher."""
+    if inspect.iscoroutinefunction(callback):
+        async def _each(lines: List[str]):
+            for line in lines:
+                await callback(line)
+    else:
+        def _each(lines: List[str]):
+            for line in lines:
+                callback(line)
+    return _each
+
+def _plist_value(element) -> Any:
+    """Converts one lxml plist element into the Python value plistlib would produce."""
+    tag = element.tag
+    if tag == 'dict':
+        result = {}
+        children = iter(element)
+        for key_element in children:
+            if key_element.tag != 'key':
+                raise ValueError(f"Expected <key> in plist dict, got <{key_element.tag}>")
+            value_element = next(children, None)
+            if value_element is None:
+                raise ValueError(f"Missing value for plist key '{key_element.text}'")
+            result[key_element.text or ''] = _plist_value(value_element)
+        return result
+    if tag == 'array':
+        return [_plist_value(child) for child in element]
+    if tag == 'string':
+        return element.text or ''
+    if tag == 'integer':
+        text = (element.text or '').strip()
+        return int(text, 16) if text.startswith('0x') else int(text)
+    if tag == 'real':
+        return float(element.text)
+    if tag == 'true':
+        return True
+    if tag == 'false':
+        return False
+    if tag == 'date':
+        return datetime.datetime.strptime(element.text.strip(), '%Y-%m-%dT%H:%M:%SZ')
+    if tag == 'data':
+        return base64.b64decode((element.text or '').encode('ascii'))
+    raise ValueError(f"Unsupported plist element <{tag}>")
+
+_BINARY_PLIST_MAGIC = b'bplist00'
+
+def _parse_plist(data: bytes) -> Any:
+    """
+    Parses a plist document. Binary plists go straight to plistlib's binary
+    reader; XML plists use lxml when available and plistlib otherwise.
+    Produces the same Python values as plistlib.loads.
+
+    Raises:
+        plistlib.InvalidFileException / ValueError: If the data is not a valid plist.
+    """
+    # Imported here rather than at module level: plistlib pulls in the expat
+    # XML parser, which most launches (mdfind/mdutil only) never need.
+    import plistlib
+    if data[:8] == _BINARY_PLIST_MAGIC:
+        return plistlib.loads(data, fmt=plistlib.FMT_BINARY)
+    if _lxml_etree is None:
+        from xml.parsers.expat import ExpatError
+        try:
+            return plistlib.loads(data, fmt=plistlib.FMT_XML)
+        except ExpatError as e:
+            raise plistlib.InvalidFileException(f"Invalid XML plist: {e}") from e
+
+    parser = _lxml_etree.XMLParser(huge_tree=True, resolve_entities=False, no_network=True,
+                                   remove_comments=True, remove_pis=True)
+    try:
+        root = _lxml_etree.fromstring(data, parser)
+    except _lxml_etree.XMLSyntaxError as e:
+        raise plistlib.InvalidFileException(f"Invalid XML plist: {e}") from e
+    if root.tag != 'plist' or len(root) != 1:
+        raise plistlib.InvalidFileException("Invalid file")
+    return _plist_value(root[0])
+
+async def _iter_command_batches(command: List[str], name: str, batch_size: int = None,
+                                check: bool = False, **stream_kwargs) -> AsyncGenerator[List[str], None]:
+    """
+    Runs a command and yields its output lines, as they arrive, in lists of
+    up to `batch_size` lines (or everything available if batch_size is None).
+
+    Lines are buffered in a deque and the consumer is woken via an Event, so
+    each wake-up drains everything that arrived in the meantime instead of
+    paying a queue get() per line. The process is killed if the consumer stops
+    iterating early, and the generator does not finish closing until the
+    process has been reaped.
+
+    Raises:
+        CommandError: If streaming fails, or if `check` is True and the
+                      command exits with a non-zero status.
+    """
+    buffered = collections.deque()
+    ready = asyncio.Event()
+    finished = False
+
+    async def _buffer_line(line: str):
+        buffered.append(line)
+        ready.set()
+
+    async def _run_stream():
+        nonlocal finished
+        try:
+            return await run_streaming_command_async(command, _buffer_line, **stream_kwargs)
+        finally:
+            finished = True  # End of stream
+            ready.set()
+
+    stream_task = asyncio.create_task(_run_stream())
+    try:
+        while True:
+            await ready.wait()
+            ready.clear()
+            while buffered:
+                count = len(buffered) if batch_size is None else min(batch_size, len(buffered))
+                yield [buffered.popleft() for _ in range(count)]
+            if finished and not buffered:
+                break
+        try:
+            return_code = await stream_task
+        except Exception as e:
+            raise CommandError(f"Error streaming {name}: {e}")
+        if check and return_code != 0:
+            raise CommandError(f"{name} command failed (exit code {return_code})", return_code)
+    finally:
+        if not stream_task.done():
+            stream_task.cancel()
+            # Wait for the cancelled stream to kill and reap the process; a
+            # bare cancel() would leave that to a later loop iteration.
+            # asyncio.wait() does not re-raise the task's CancelledError.
+            await asyncio.wait([stream_task])
+
+async def _iter_command_lines(command: List[str], name: str, check: bool = False,
+                              **stream_kwargs) -> AsyncGenerator[str, None]:
+    """Like _iter_command_batches(), but yields the output one line at a time."""
+    async for batch in _iter_command_batches(command, name, check=check, **stream_kwargs):
+        for line in batch:
+            yield line
+
+# A finished non-live mdfind result is handed to identical queries arriving
+# within this many seconds, in addition to queries made while it runs.
+_MDFIND_COALESCE_WINDOW = 0.05
+# Both keyed by (event loop, argv): a search is only shared within its own
+# loop. Finished entries are expired on lookup rather than by a timer on the
+# loop, so a loop that stops or closes cannot leave one behind for good.
+_mdfind_pending: Dict[tuple, asyncio.Future] = {}
+_mdfind_finished_at: Dict[tuple, float] = {}
+_mdfind_waiters: Dict[asyncio.Future, int] = {}
+
+async def _search_paths(query: str, paths: Optional[List[str]], command: List[str]) -> List[str]:
+    """
+    Answers a one-shot search in-process through the MDQuery API when it is
+    available and understands the query, and with `command` (mdfind) otherwise.
+    """
+    # Imported here rather than at module level: loading CoreFoundation and
+    # CoreServices is only worth paying for once a search is actually run.
+    from spotlight_gui.core import api_mdquery
+    if api_mdquery.MDQUERY_AVAILABLE:
+        # Bounded like the mdfind fallback; cancelling the search (e.g. by the
+        # UI debounce) sets `stop` so the worker thread calls MDQueryStop and
+        # returns instead of staying blocked in the executor.
+        stop = threading.Event()
+        try:
+            results = await asyncio.to_thread(api_mdquery.query_paths, query, paths,
+                                              async_subprocess.DEFAULT_TIMEOUT, stop)
+        finally:
+            stop.set()
+        if results is not None:
+            return results
+    return await _run_mdfind(command)
+
+async def _run_mdfind(command: List[str]) -> List[str]:
+    """Runs a non-live mdfind command and returns the matching paths."""
+    # Collect paths line by line as they arrive from the pipe, rather than
+    # buffering the whole output and splitting it afterwards.
+    results: List[str] = []
+    stderr_lines: List[str] = []
+
+    async def _collect_result(line: str):
+        if line:
+            results.append(line)
+
+    async def _collect_error(line: str):
+        stderr_lines.append(line)
+
+    return_code = await run_streaming_command_async(command, _collect_result, _collect_error,
+                                                    timeout=async_subprocess.DEFAULT_TIMEOUT)
+    if return_code != 0:
+        stderr = '\n'.join(stderr_lines)
+        raise CommandError(f"mdfind command failed (exit code {return_code}): {stderr}",
+                           return_code, '\n'.join(results), stderr)
+    return results
+
 async def mdfind(query: str, live: bool = False, paths: List[str] = None,
-                 output_callback: Callable[[str], None] = None) -> Union[List[str], AsyncGenerator[str, None]]:
+                 output_callback: Callable[[str], None] = None,
+                 blocking: bool = False,
+                 bulk_callback: Callable[[List[str]], None] = None) -> Union[List[str], AsyncGenerator[str, None]]:
     """
     Executes the mdfind command.
 
@@ -29,104 +317,230 @@ async def mdfind(query: str, live: bool = False, paths: List[str] = None,
         query: The search predicate string.
         live: If True, uses the -live flag to stream results.
         paths: List of directories to search. Defaults to all indexed locations.
-        output_callback: A callable to receive streamed results if `live` is True.
-                         If provided, results are sent via the callback.
-                         If `live` is True and `output_callback` is None, this function
+        output_callback: A callable to receive streamed results one path at a
+                         time if `live` is True.
+                         If `live` is True and no callback is given, this function
                          returns an async generator yielding paths.
+        blocking: If True, a plain (non-coroutine) callback is run in a worker
+                  thread; otherwise it runs on the event loop and must not block.
+        bulk_callback: Like output_callback, but receives lists of paths,
+                       batched by up to 128 lines or 50ms. Takes precedence
+                       over output_callback.
 
     Returns:
         If live is False, returns a list of matching file paths.
-        If live is True and output_callback is provided, returns an empty list.
-        If live is True and output_callback is None, returns an async generator.
+        If live is True and a callback is provided, returns an empty list.
+        If live is True and no callback is provided, returns an async generator.
 
     Raises:
         CommandError: If mdfind command fails.
         SystemCheckError: If a search path matches the forbidden volume.
     """
-    command = ['mdfind', query]
+    if not live:
+        return await mdfind_collect(query, paths)
+
+    command = _mdfind_command(query, paths, live=True)
+    if bulk_callback or output_callback:
+        # Callback mode
+        batcher = _LineBatcher(bulk_callback or _per_line(output_callback), blocking)
+        try:
+            await run_streaming_command_async(command, batcher.add)
+            return []
+        except Exception as e:
+            raise CommandError(f"Error streaming mdfind: {e}")
+        finally:
+            await batcher.flush()
+    else:
+        # New async generator mode
+        return _iter_command_lines(command, 'mdfind')
+
+def _mdfind_command(query: str, paths: Optional[List[str]], live: bool = False) -> List[str]:
+    """Builds the mdfind argv, checking any search paths against the protection rule."""
     if paths:
-        for path in paths:
-            enforce_volume_protection_rule(path)
-        command.extend(['-onlyin', *paths])
-
-    if live:
-        command.append('-live')
-        if output_callback:
-            # Legacy callback mode
-            async def _stream_handler(line: str):
-                if line:
-                    await asyncio.to_thread(output_callback, line)
-            try:
-                await run_streaming_command_async(command, _stream_handler)
-                return []
-            except Exception as e:
-                raise CommandError(f"Error streaming mdfind: {e}")
-        else:
-            # New async generator mode
-            async def generator():
-                queue = asyncio.Queue()
+        enforce_volume_protection_rule_many(paths)
+        return ['mdfind', query, '-onlyin', *paths, *(('-live',) if live else ())]
+    return ['mdfind', query, '-live'] if live else ['mdfind', query]
 
-                async def _queue_filler(line: str):
-                    await queue.put(line)
+def _expire_mdfind_results(now: float):
+    """Forgets finished searches older than _MDFIND_COALESCE_WINDOW."""
+    for key, finished_at in list(_mdfind_finished_at.items()):
+        if now - finished_at >= _MDFIND_COALESCE_WINDOW:
+            del _mdfind_finished_at[key]
+            _mdfind_pending.pop(key, None)
 
-                async def _run_stream():
-                    try:
-                        await run_streaming_command_async(command, _queue_filler)
-                    finally:
-                        await queue.put(None)  # Sentinel for end-of-stream
+async def mdfind_collect(query: str, paths: List[str] = None) -> List[str]:
+    """
+    Runs a one-shot (non-live) mdfind and returns the matching file paths.
+    Identical searches issued in a burst share one mdfind process. Queries in
+    raw Spotlight syntax are run in-process via the MDQuery API when possible.
 
-                stream_task = asyncio.create_task(_run_stream())
-                try:
-                    while True:
-                        item = await queue.get()
-                        if item is None:
-                            break
-                        yield item
-                finally:
-                    if not stream_task.done():
-                        stream_task.cancel()
-            return generator()
+    Raises:
+        CommandError: If mdfind command fails.
+        SystemCheckError: If a search path matches the forbidden volume.
+    """
+    command = _mdfind_command(query, paths)
+    _expire_mdfind_results(time.monotonic())
+    key = (asyncio.get_running_loop(), tuple(command))
+    task = _mdfind_pending.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_search_paths(query, paths, command))
+        _mdfind_pending[key] = task
+        task.add_done_callback(lambda t: _mdfind_finished_at.__setitem__(key, time.monotonic()))
+    # shield() keeps one cancelled caller from cancelling the search for
+    # the others sharing it; the search itself is cancelled (killing mdfind
+    # or stopping the MDQuery) once every caller has gone.
+    _mdfind_waiters[task] = _mdfind_waiters.get(task, 0) + 1
+    try:
+        return list(await asyncio.shield(task))
+    finally:
+        _mdfind_waiters[task] -= 1
+        if not _mdfind_waiters[task]:
+            del _mdfind_waiters[task]
+            if not task.done():
+                task.cancel()
+
+def mdfind_stream(query: str, paths: List[str] = None,
+                  batch_size: int = 64) -> AsyncGenerator[List[str], None]:
+    """
+    Runs a live mdfind and returns an async generator yielding lists of up to
+    `batch_size` paths as they arrive. Iterating batches rather than single
+    paths spreads the generator resume cost over many results.
+
+    Raises:
+        SystemCheckError: If a search path matches the forbidden volume.
+        CommandError: While iterating, if streaming fails.
+    """
+    return _iter_command_batches(_mdfind_command(query, paths, live=True), 'mdfind', batch_size)
+
+def _parse_mdutil_status_output(stdout: str) -> List[tuple]:
+    """
+    Splits `mdutil -s` output into (volume, status_text) pairs, in output order.
+    Accepts both the multi-line form mdutil prints per volume
+    ("/Volumes/Disk:" followed by an indented status line) and the
+    single-line form ("/Volumes/Disk: Indexing enabled.").
+    """
+    blocks = []
+    for line in stdout.splitlines():
+        if not line.strip():
+            continue
+        if line[0].isspace():
+            # Indented continuation line belonging to the current volume.
+            if blocks:
+                volume, text = blocks[-1]
+                blocks[-1] = (volume, f"{text} {line.strip()}".strip())
+            continue
+        head, sep, rest = line.partition(': ')
+        if sep and rest.strip():
+            blocks.append((head, rest.strip()))
+        elif line.rstrip().endswith(':'):
+            blocks.append((line.rstrip()[:-1], ''))
+    return blocks
+
+# Matches the indexing state in an mdutil status line, e.g. "Indexing enabled."
+# or "Indexing and searching disabled.".
+_MDUTIL_STATE_RE = re.compile(r'(indexing )?(enabled|disabled)', re.IGNORECASE)
+
+def _mdutil_status_entry(volume: str, status_text: str) -> Dict[str, Any]:
+    """Builds the status dictionary returned by mdutil_status for one volume."""
+    match = _MDUTIL_STATE_RE.search(status_text)
+    if match is None:
+        return {'volume': volume, 'indexed': False, 'state': 'unknown'}
+    state = match.group(2).lower()
+    return {
+        'volume': volume,
+        'indexed': state == 'enabled' and match.group(1) is not None,
+        'state': state
+    }
+
+# Successful mdutil_status results are reused for this many seconds, so rapid
+# refreshes from the UI don't spawn a new mdutil process each time. Indexing
+# state rarely changes, and mdutil_manage_index() invalidates what it touches.
+_STATUS_CACHE_TTL = 5.0
+_status_cache: Dict[str, tuple] = {}  # volume_path -> (time.monotonic(), status dict)
+_status_locks: Dict[str, asyncio.Lock] = {}
+
+def _cached_status(volume_path: str) -> Optional[Mapping[str, Any]]:
+    """Returns the cached status for volume_path if it is still fresh."""
+    cached = _status_cache.get(volume_path)
+    if cached and time.monotonic() - cached[0] < _STATUS_CACHE_TTL:
+        return cached[1]
+    return None
+
+def _store_status(volume_path: str, status: Dict[str, Any]) -> Mapping[str, Any]:
+    """
+    Caches status as a read-only view and returns that view. Being immutable,
+    the same object can be handed to every caller without defensive copies.
+    """
+    frozen = types.MappingProxyType(status)
+    _status_cache[volume_path] = (time.monotonic(), frozen)
+    return frozen
+
+def invalidate_status_cache(volume_path: str = None) -> None:
+    """Drops the cached mdutil status for volume_path, or for every volume if None."""
+    if volume_path is None:
+        _status_cache.clear()
     else:
-        return_code, stdout, stderr = await run_command_async(command)
-        if return_code != 0:
-            raise CommandError(f"mdfind command failed (exit code {return_code}): {stderr}",
-                               return_code, stdout, stderr)
-        return [line for line in stdout.splitlines() if line.strip()]
+        _status_cache.pop(volume_path, None)
 
-async def mdutil_status(volume_path: str = '/') -> Dict[str, Any]:
+async def mdutil_status(volume_path: str = '/', force: bool = False) -> Mapping[str, Any]:
     """
     Gets the indexing status for a given volume.
 
+    Results are cached for a few seconds per volume, and concurrent calls for
+    the same volume share a single mdutil invocation. Use
+    mdutil_status.invalidate(volume_path) to drop a cached entry.
+
     Args:
         volume_path: The path to the volume (e.g., '/', '/Volumes/MyDisk').
+        force: If True, bypasses the cache and always runs mdutil.
 
     Returns:
-        A dictionary containing the status, e.g., {'volume': '/', 'indexed': True, 'state': 'enabled'}.
+        A read-only mapping containing the status, e.g.,
+        {'volume': '/', 'indexed': True, 'state': 'enabled'}. The same
+        object is shared by all callers while it is cached; copy it with
+        dict() to modify it.
 
     Raises:
         CommandError: If mdutil command fails.
         SystemCheckError: If the volume path matches the forbidden volume.
     """
-    enforce_volume_protection_rule(volume_path)
-    command = ['mdutil', '-s', volume_path]
-    return_code, stdout, stderr = await run_command_async(command)
+    _check_path(volume_path)
+    if not force:
+        cached = _cached_status(volume_path)
+        if cached is not None:
+            return cached
 
-    if return_code != 0:
-        raise CommandError(f"mdutil -s command failed (exit code {return_code}): {stderr}",
-                           return_code, stdout, stderr)
+    lock = _status_locks.setdefault(volume_path, asyncio.Lock())
+    async with lock:
+        # Another caller may have refreshed the entry while we waited.
+        if not force:
+            cached = _cached_status(volume_path)
+            if cached is not None:
+                return cached
 
-    status_line = stdout.strip()
-    if status_line:
-        parts = status_line.split(': ')
-        if len(parts) >= 2:
-            vol_name = parts[0]
-            status_text = parts[1].lower()
-            return {
-                'volume': vol_name,
-                'indexed': 'indexing enabled' in status_text,
-                'state': 'enabled' if 'enabled' in status_text else ('disabled' if 'disabled' in status_text else 'unknown')
-            }
-    return {'volume': volume_path, 'indexed': False, 'state': 'unknown', 'raw_output': stdout.strip()}
+        command = ['mdutil', '-s', volume_path]
+        return_code, stdout, stderr = await run_command_async(command)
+
+        if return_code != 0:
+            raise CommandError(f"mdutil -s command failed (exit code {return_code}): {stderr}",
+                               return_code, stdout, stderr)
+
+        blocks = _parse_mdutil_status_output(stdout)
+        if blocks and blocks[0][1]:
+            status = _mdutil_status_entry(*blocks[0])
+        else:
+            status = {'volume': volume_path, 'indexed': False, 'state': 'unknown', 'raw_output': stdout.strip()}
+        return _store_status(volume_path, status)
+
+mdutil_status.invalidate = invalidate_status_cache
+
+# mdutil flags for each mdutil_manage_index action.
+_ACTION_ARGS = {
+    'enable': ('-i', 'on'),
+    'disable': ('-i', 'off'),
+    'erase': ('-E',),
+    'rebuild': ('-L',),
+}
 
 async def mdutil_manage_index(volume_path: str, action: str) -> Dict[str, Any]:
     """
@@ -144,21 +558,17 @@ async def mdutil_manage_index(volume_path: str, action: str) -> Dict[str, Any]:
         ValueError: If an invalid action is specified.
         SystemCheckError: If the volume path matches the forbidden volume.
     """
-    enforce_volume_protection_rule(volume_path)
-
-    base_command = ['mdutil']
-    if action == 'enable':
-        base_command.extend(['-i', 'on', volume_path])
-    elif action == 'disable':
-        base_command.extend(['-i', 'off', volume_path])
-    elif action == 'erase':
-        base_command.extend(['-E', volume_path])
-    elif action == 'rebuild':
-        base_command.extend(['-L', volume_path])
-    else:
-        raise ValueError(f"Invalid action: {action}. Must be 'enable', 'disable', 'erase', or 'rebuild'.")
+    _check_path(volume_path)
+
+    try:
+        action_args = _ACTION_ARGS[action]
+    except KeyError:
+        raise ValueError(f"Invalid action: {action}. Must be 'enable', 'disable', 'erase', or 'rebuild'.") from None
+    base_command = ['mdutil', *action_args, volume_path]
 
     return_code, stdout, stderr = await run_command_async(base_command, timeout=300)
+    # The volume's indexing state has (or may have) changed.
+    mdutil_status.invalidate(volume_path)
 
     if return_code != 0:
         raise CommandError(f"mdutil {action} command failed (exit code {return_code}): {stderr}",
@@ -181,7 +591,7 @@ async def mdutil_progress(volume_path: str = '/') -> str:
         CommandError: If mdutil command fails.
         SystemCheckError: If the volume path matches the forbidden volume.
     """
-    enforce_volume_protection_rule(volume_path)
+    _check_path(volume_path)
     command = ['mdutil', '-p', volume_path]
     return_code, stdout, stderr = await run_command_async(command)
 
@@ -190,12 +600,39 @@ async def mdutil_progress(volume_path: str = '/') -> str:
                            return_code, stdout, stderr)
     return stdout.strip()
 
-async def mdls(file_path: str) -> Dict[str, Any]:
+async def _mdls_raw(file_path: str, attrs: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Fetches the named attributes with `mdls -raw`, which prints the values as
+    plain text separated by NUL bytes, so no plist parsing is needed.
+    Attributes without a value ("(null)") map to None.
+    """
+    command = ['mdls', '-raw']
+    for attr in attrs:
+        command.extend(['-name', attr])
+    command.append(file_path)
+    return_code, stdout, stderr = await run_command_async(command, text=False)
+
+    stdout = stdout.decode('utf-8', errors='replace')
+    if return_code != 0:
+        raise CommandError(f"mdls command failed (exit code {return_code}): {stderr}",
+                           return_code, stdout, stderr)
+
+    values = stdout.split('\0')
+    if len(values) != len(attrs):
+        raise CommandError(f"Unexpected mdls -raw output for '{file_path}': expected {len(attrs)} "
+                           f"values, got {len(values)}", return_code=0, stdout=stdout, stderr=stderr)
+    return {attr: (None if value == '(null)' else value) for attr, value in zip(attrs, values)}
+
+async def mdls(file_path: str, attrs: List[str] = None) -> Dict[str, Any]:
     """
     Gets metadata attributes for a given file path.
 
     Args:
         file_path: The path to the file.
+        attrs: Optional list of attribute names to fetch. When given, only
+               those attributes are queried (via `mdls -raw`) and their values
+               are returned as strings, or None if unset; multi-valued
+               attributes come back in mdls' textual "( ... )" form.
 
     Returns:
         A dictionary where keys are metadata attribute names (e.g., 'kMDItemDisplayName')
@@ -206,90 +643,435 @@ async def mdls(file_path: str) -> Dict[str, Any]:
     """
     if not file_path or not os.path.exists(file_path):
         return {}
-        
-    command = ['mdls', '-plist', '-', file_path]
-    return_code, stdout, stderr = await run_command_async(command)
+    if attrs:
+        return await _mdls_raw(file_path, attrs)
+    return await _mdls_plist(file_path)
+
+async def _mdls_plist(file_path: str, fields: List[str] = ()) -> Dict[str, Any]:
+    """Runs `mdls -plist -` on one file, limited to `fields` when given, and parses the result."""
+    command = ['mdls', *(arg for field in fields for arg in ('-name', field)), '-plist', '-', file_path]
+    # Keep stdout as bytes: the plist parser takes bytes, so decoding it to
+    # str only to encode it again would be wasted work.
+    return_code, stdout, stderr = await run_command_async(command, text=False)
 
     if return_code != 0:
+        stdout = stdout.decode('utf-8', errors='replace')
         raise CommandError(f"mdls command failed (exit code {return_code}): {stderr}",
                            return_code, stdout, stderr)
 
     try:
-        # The output from mdls might contain multiple plist objects
-        # We need to find the root one, which is the first one.
-        plist_content = stdout.encode('utf-8')
-        metadata_list = plistlib.loads(plist_content, fmt=plistlib.FMT_XML)
-        # mdls -plist - returns an array of dictionaries
-        return metadata_list[0] if metadata_list else {}
-    except (plistlib.InvalidFileException, ValueError, TypeError, IndexError) as e:
+        metadata = _parse_plist(stdout)
+        # mdls -plist - emits a single dictionary for one file; tolerate an
+        # array of dictionaries as well.
+        if isinstance(metadata, list):
+            return metadata[0] if metadata else {}
+        return metadata or {}
+    except (ValueError, TypeError, IndexError) as e:  # plistlib.InvalidFileException is a ValueError
+        stdout = stdout.decode('utf-8', errors='replace')
         raise CommandError(f"Failed to parse mdls plist output for '{file_path}': {e}\nRaw output:\n{stdout}",
                            return_code=0, stdout=stdout, stderr=stderr)
 
-async def log_show(predicate: str, tail: bool = False, output_callback: Callable[[str], None] = None) -> Union[List[str], None]:
+async def mdls_fields(file_path: str, fields: List[str]) -> Dict[str, Any]:
+    """
+    Gets only the named metadata attributes for a file, with their typed values.
+
+    Unlike mdls(file_path, attrs), which returns the `mdls -raw` strings, the
+    values keep their plist types (int, datetime, list, ...), but mdls is asked
+    for just these attributes so its output stays small.
+
+    Args:
+        file_path: The path to the file.
+        fields: Attribute names to fetch, e.g. ['kMDItemDisplayName', 'kMDItemFSSize'].
+
+    Returns:
+        A dictionary with one entry per requested field; fields the file has
+        no value for map to None. Empty if the file does not exist.
+
+    Raises:
+        CommandError: If mdls command fails.
+    """
+    if not file_path or not os.path.exists(file_path):
+        return {}
+    if not fields:
+        return {}
+    metadata = await _mdls_plist(file_path, fields)
+    return {field: metadata.get(field) for field in fields}
+
+def _split_plist_documents(data: bytes) -> List[bytes]:
+    """Splits concatenated XML plist documents at their XML declarations."""
+    return [b'<?xml' + part for part in data.split(b'<?xml') if part.strip()]
+
+async def mdls_many(file_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Gets metadata attributes for several files with a single `mdls` process.
+
+    Args:
+        file_paths: Paths of the files to inspect.
+
+    Returns:
+        A dictionary mapping each path to its metadata dictionary, as returned
+        by mdls(). Paths that do not exist map to an empty dictionary.
+
+    Raises:
+        CommandError: If mdls fails or its output cannot be matched to the files.
+    """
+    results: Dict[str, Dict[str, Any]] = {path: {} for path in file_paths}
+    existing = [path for path in results if path and os.path.exists(path)]
+    if not existing:
+        return results
+
+    command = ['mdls', '-plist', '-', *existing]
+    return_code, stdout, stderr = await run_command_async(command, text=False)
+    if return_code != 0:
+        stdout = stdout.decode('utf-8', errors='replace')
+        raise CommandError(f"mdls command failed (exit code {return_code}): {stderr}",
+                           return_code, stdout, stderr)
+
+    try:
+        # mdls writes one plist document per file; a single document holding
+        # an array of dictionaries is accepted as well.
+        documents = [_parse_plist(document) for document in _split_plist_documents(stdout)]
+        if len(documents) == 1 and isinstance(documents[0], list):
+            documents = documents[0]
+    except (ValueError, TypeError) as e:  # plistlib.InvalidFileException is a ValueError
+        stdout = stdout.decode('utf-8', errors='replace')
+        raise CommandError(f"Failed to parse mdls plist output: {e}",
+                           return_code=0, stdout=stdout, stderr=stderr)
+
+    if len(documents) != len(existing):
+        raise CommandError(f"mdls returned {len(documents)} metadata records for {len(existing)} files",
+                           return_code=0, stdout=stdout.decode('utf-8', errors='replace'), stderr=stderr)
+    for path, metadata in zip(existing, documents):
+        results[path] = metadata or {}
+    return results
+
+# Reader buffer size for `log show --stream`, which can emit megabytes per second.
+_LOG_STREAM_LIMIT = 4 * 1024 * 1024
+
+def _log_interval(since: datetime.timedelta) -> str:
+    """Formats a timedelta as a `log show --last` interval, e.g. '1h' or '90'."""
+    seconds = max(int(since.total_seconds()), 1)
+    if seconds % 3600 == 0:
+        return f"{seconds // 3600}h"
+    if seconds % 60 == 0:
+        return f"{seconds // 60}m"
+    return str(seconds)
+
+def _json_loads(data: str) -> Any:
+    """Parses JSON with orjson when it is installed, else with the json module."""
+    if _json_fast is not None:
+        return _json_fast.loads(data)
+    import json
+    return json.loads(data)
+
+def _ndjson_entry(line: str) -> Optional[Dict[str, Any]]:
+    """Parses one `log --style ndjson` line; returns None for non-JSON lines such as log's banner."""
+    if not line.startswith('{'):
+        return None
+    try:
+        return _json_loads(line)
+    except ValueError:  # orjson.JSONDecodeError is a ValueError too
+        return None
+
+async def _log_show_last(predicate: str, since: datetime.timedelta, style: str = None) -> List[str]:
+    """Returns the archived log entries matching predicate from the last `since`."""
+    command = ['log', 'show', '--predicate', predicate, '--last', _log_interval(since)]
+    if style:
+        command.extend(['--style', style])
+    return_code, stdout, stderr = await run_command_async(command, timeout=120)
+    if return_code != 0:
+        raise CommandError(f"log show command failed (exit code {return_code}): {stderr}",
+                           return_code, stdout, stderr)
+    return [line for line in stdout.splitlines() if line.strip()]
+
+class LogTailService:
+    """
+    Serves repeated recent-log queries from memory.
+
+    The first query for a predicate scans the log archive once and starts a
+    `log show --stream` process for that predicate; later queries are
+    answered from the entries buffered since, without rescanning the archive.
+    Entries are timestamped when received (entries from the initial scan when
+    the scan completes), so the `since` cut-off is approximate.
+    """
+    def __init__(self, max_lines: int = 50000):
+        self._max_lines = max_lines
+        self._buffers: Dict[str, collections.deque] = {}
+        self._streams: Dict[str, asyncio.Task] = {}
+        self._seeding: Dict[str, asyncio.Task] = {}
+
+    async def recent(self, predicate: str,
+                     since: datetime.timedelta = datetime.timedelta(hours=1)) -> List[str]:
+        """Returns the buffered entries for predicate received within `since`."""
+        buffer = self._buffers.get(predicate)
+        if buffer is None:
+            seeding = self._seeding.get(predicate)
+            if seeding is None:
+                seeding = asyncio.ensure_future(self._start(predicate, since))
+                self._seeding[predicate] = seeding
+                seeding.add_done_callback(lambda t: self._seeding.pop(predicate, None))
+            # Use the seeded buffer directly: if the stream has already exited
+            # (or stop() ran meanwhile) it is gone from self._buffers by now.
+            buffer = await asyncio.shield(seeding)
+        cutoff = time.monotonic() - since.total_seconds()
+        return [line for stamp, line in buffer if stamp >= cutoff]
+
+    async def _start(self, predicate: str, since: datetime.timedelta) -> collections.deque:
+        pending = []
+
+        async def _append(line: str):
+            if line:
+                entry = (time.monotonic(), line)
+                buffer = self._buffers.get(predicate)
+                if buffer is not None:
+                    buffer.append(entry)
+                else:
+                    pending.append(entry)
+
+        # Start streaming before scanning the archive so entries logged during
+        # the scan are not missed.
+        command = ['log', 'show', '--predicate', predicate, '--stream']
+        stream = asyncio.ensure_future(
+            run_streaming_command_async(command, _append, limit=_LOG_STREAM_LIMIT))
+        try:
+            history = await _log_show_last(predicate, since)
+        except BaseException:
+            stream.cancel()
+            raise
+
+        now = time.monotonic()
+        buffer = collections.deque(((now, line) for line in history), maxlen=self._max_lines)
+        buffer.extend(pending)
+        self._buffers[predicate] = buffer
+        self._streams[predicate] = stream
+        stream.add_done_callback(lambda t: self._forget(predicate, t))
+        return buffer
+
+    def _forget(self, predicate: str, stream: asyncio.Task):
+        # The stream ended (or failed); the next query starts over.
+        if self._streams.get(predicate) is stream:
+            del self._streams[predicate]
+            self._buffers.pop(predicate, None)
+        if not stream.cancelled() and stream.exception() is not None:
+            print(f"Warning: log stream for predicate '{predicate}' ended: {stream.exception()}",
+                  file=sys.stderr)
+
+    def stop(self, predicate: str = None):
+        """Stops the stream for predicate, or every stream if None."""
+        predicates = list(self._streams) if predicate is None else [predicate]
+        for name in predicates:
+            stream = self._streams.pop(name, None)
+            self._buffers.pop(name, None)
+            if stream is not None:
+                stream.cancel()
+
+@functools.cache
+def get_log_tail_service() -> LogTailService:
+    """Returns the shared LogTailService used by log_show(persistent=True)."""
+    return LogTailService()
+
+def log_show_iter(predicate: str, tail: bool = False) -> AsyncGenerator[str, None]:
+    """
+    Like log_show(), but returns an async generator that yields log entries as
+    `log` writes them, instead of collecting the whole output into a list.
+
+    Args:
+        predicate: The log predicate string.
+        tail: If True, streams new log entries until the consumer stops
+              iterating; otherwise yields the entries from the last hour.
+
+    Raises (while iterating):
+        CommandError: If the log command fails.
+    """
+    command = ['log', 'show', '--predicate', predicate]
+    if tail:
+        command.append('--stream')
+    else:
+        command.extend(['--last', '1h'])
+    return _iter_command_lines(command, 'log show', check=not tail, limit=_LOG_STREAM_LIMIT)
+
+async def log_show(predicate: str, tail: bool = False, output_callback: Callable[[str], None] = None,
+                   blocking: bool = False, persistent: bool = False,
+                   bulk_callback: Callable[[List[str]], None] = None,
+                   style: str = 'syslog') -> Union[List[str], List[Dict[str, Any]], None]:
     """
     Executes the log show command to retrieve system logs.
 
+    When tailing, the output pipe is read with a 4 MiB buffer so a busy log
+    stream is not throttled by the default 64 KiB reader buffer. stderr is
+    still read, since `log` reports predicate errors there.
+
     Args:
         predicate: The log predicate string.
         tail: If True, continuously streams new log entries.
-        output_callback: A callable to receive streamed log entries if `tail` is True.
+        output_callback: A callable to receive streamed log entries one at a
+                         time if `tail` is True.
+        blocking: If True, a plain (non-coroutine) callback is run in a worker
+                  thread; otherwise it runs on the event loop and must not block.
+        persistent: If True and tail is False, the last hour of entries is
+                    served by the shared LogTailService, which keeps a log
+                    stream running for the predicate. Use this when the same
+                    predicate is polled repeatedly.
+        bulk_callback: Like output_callback, but receives lists of entries,
+                       batched by up to 128 lines or 50ms. Takes precedence
+                       over output_callback.
+        style: 'syslog' for log's default text lines, or 'json' to have log
+               emit ndjson and receive each entry as a dictionary (parsed
+               with orjson when installed). Not supported with persistent.
 
     Returns:
         If tail is False, returns a list of log entries. Otherwise, returns None.
 
     Raises:
         CommandError: If log command fails.
-        NotImplementedError: If tail is True but output_callback is None.
+        NotImplementedError: If tail is True but no callback is given.
+        ValueError: If style is unknown, or 'json' is combined with persistent.
     """
+    if style not in ('syslog', 'json'):
+        raise ValueError(f"Invalid log style: {style}. Must be 'syslog' or 'json'.")
+    as_json = style == 'json'
     command = ['log', 'show', '--predicate', predicate]
     if tail:
         command.append('--stream')
-        if output_callback is None:
+        if as_json:
+            command.extend(['--style', 'ndjson'])
+        if output_callback is None and bulk_callback is None:
             raise NotImplementedError("Live log streaming requires an output_callback.")
         
-        async def _stream_handler(line: str):
-            if line:
-                await asyncio.to_thread(output_callback, line)
+        batcher = _LineBatcher(bulk_callback or _per_line(output_callback), blocking)
+        async def _add_json_entry(line: str):
+            entry = _ndjson_entry(line)
+            if entry is not None:
+                await batcher.add(entry)
+
+        add_entry = _add_json_entry if as_json else batcher.add
         try:
-            await run_streaming_command_async(command, _stream_handler)
+            await run_streaming_command_async(command, add_entry, limit=_LOG_STREAM_LIMIT)
             return None
         except Exception as e:
             raise CommandError(f"Error streaming log: {e}")
+        finally:
+            await batcher.flush()
+    elif persistent:
+        if as_json:
+            raise ValueError("style='json' is not supported for persistent log queries.")
+        return await get_log_tail_service().recent(predicate, datetime.timedelta(hours=1))
+    elif as_json:
+        lines = await _log_show_last(predicate, datetime.timedelta(hours=1), style='ndjson')
+        return [entry for entry in map(_ndjson_entry, lines) if entry is not None]
     else:
-        command.extend(['--last', '1h'])
-        return_code, stdout, stderr = await run_command_async(command, timeout=120)
-        if return_code != 0:
-            raise CommandError(f"log show command failed (exit code {return_code}): {stderr}",
-                               return_code, stdout, stderr)
-        return [line for line in stdout.splitlines() if line.strip()]
+        return await _log_show_last(predicate, datetime.timedelta(hours=1))
 
-async def list_indexed_volumes() -> List[Dict[str, Any]]:
+async def _status_safe(path: str) -> Mapping[str, Any]:
+    """Returns mdutil_status(path), or an error entry for the volume instead of raising."""
+    try:
+        return await mdutil_status(path)
+    except SystemCheckError as e:
+        return {'volume': path, 'indexed': 'restricted', 'state': 'restricted', 'error': str(e)}
+    except CommandError as e:
+        return {'volume': path, 'indexed': 'error', 'state': 'error', 'error': e.message}
+
+async def list_indexed_volumes() -> List[Mapping[str, Any]]:
     """
     Lists all mounted volumes on macOS and their Spotlight indexing status.
 
     Returns:
-        A list of dictionaries, each containing volume info.
+        A list of mappings, each containing volume info. Statuses served from
+        the mdutil status cache are read-only.
     """
-    if not is_macos():
+    if not IS_MACOS:
         return []
 
-    check_paths = ['/']
+    # scandir's DirEntry objects carry the file type from the directory read.
+    # Symlinks (such as the boot volume's alias back to '/') are skipped, so
+    # no path needs realpath(); volumes are deduplicated by device id instead,
+    # one lstat() each. That also drops plain directories left in /Volumes,
+    # which live on the root filesystem rather than being mounts of their own.
+    unique_paths = ['/']
+    try:
+        seen_devices = {os.stat('/').st_dev}
+    except OSError:
+        seen_devices = set()
     try:
-        if os.path.exists('/Volumes'):
-            check_paths.extend([os.path.join('/Volumes', item) for item in os.listdir('/Volumes') if os.path.isdir(os.path.join('/Volumes', item))])
-    except Exception as e:
+        with os.scandir('/Volumes') as it:
+            for entry in it:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                try:
+                    device = entry.stat(follow_symlinks=False).st_dev
+                except OSError:
+                    continue
+                if device not in seen_devices:
+                    seen_devices.add(device)
+                    unique_paths.append(entry.path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
         print(f"Warning: Could not list /Volumes: {e}", file=sys.stderr)
 
-    unique_paths = {os.path.realpath(os.path.abspath(p)) for p in check_paths}
-    
-    results = []
-    for path in sorted(list(unique_paths)):
+    results_by_path = await mdutil_status_bulk(sorted(unique_paths))
+    return list(results_by_path.values())
+
+async def mdutil_status_bulk(volume_paths: List[str]) -> Dict[str, Mapping[str, Any]]:
+    """
+    Gets the indexing status of several volumes with at most one `mdutil -s`
+    process. Volumes with a fresh cached status (see mdutil_status()) are not
+    queried again, and the new results are cached.
+
+    Args:
+        volume_paths: The volume paths to query.
+
+    Returns:
+        A dictionary mapping each path, in the order given, to its status
+        mapping. Never raises for a single volume: protected volumes map to a
+        'restricted' entry and volumes mdutil fails on map to an 'error' entry.
+    """
+    # Apply the protection rule in-process first; only allowed volumes are
+    # passed to mdutil.
+    results_by_path: Dict[str, Mapping[str, Any]] = {}
+    stale_paths = []
+    for path in dict.fromkeys(volume_paths):
         try:
-            enforce_volume_protection_rule(path)
-            status_data = await mdutil_status(path)
-            results.append(status_data)
+            _check_path(path)
         except SystemCheckError as e:
-            results.append({'volume': path, 'state': 'restricted', 'error': str(e)})
-        except CommandError as e:
-            results.append({'volume': path, 'state': 'error', 'error': e.message})
-    return results
\ No newline at end of file
+            results_by_path[path] = {'volume': path, 'indexed': 'restricted', 'state': 'restricted', 'error': str(e)}
+            continue
+        # Volumes with a fresh cached status need no mdutil call at all.
+        cached = _cached_status(path)
+        if cached is not None:
+            results_by_path[path] = cached
+        else:
+            stale_paths.append(path)
+
+    # One `mdutil -s` invocation covers every remaining volume, instead of one
+    # subprocess per volume.
+    blocks = []
+    if stale_paths:
+        return_code, stdout, stderr = await run_command_async(['mdutil', '-s', *stale_paths])
+        if return_code == 0:
+            blocks = _parse_mdutil_status_output(stdout)
+
+    if len(blocks) == len(stale_paths):
+        # mdutil reports volumes in argument order.
+        for path, (volume, status_text) in zip(stale_paths, blocks):
+            results_by_path[path] = _store_status(path, _mdutil_status_entry(volume, status_text))
+    else:
+        # The batch output could not be matched up with the requested
+        # volumes (e.g. one of them failed); query each volume on its own,
+        # running the mdutil processes concurrently.
+        statuses = await asyncio.gather(*[_status_safe(path) for path in stale_paths])
+        results_by_path.update(zip(stale_paths, statuses))
+
+    return {path: results_by_path[path] for path in dict.fromkeys(volume_paths)}
+
+async def list_indexed_volumes_json() -> bytes:
+    """
+    Returns list_indexed_volumes() serialized as UTF-8 JSON, e.g. for passing
+    to another process. Uses orjson when it is installed.
+    """
+    # Cached statuses are read-only mapping views, which the encoders reject.
+    volumes = [dict(volume) for volume in await list_indexed_volumes()]
+    if _json_fast is not None:
+        return _json_fast.dumps(volumes)
+    import json
+    return json.dumps(volumes, separators=(',', ':')).encode('utf-8')
@@ -2,50 +2,78 @@
 import sys
 import os
 import asyncio
+import collections
 import datetime
 import json
+import logging
+import time
 import functools
 import platform # For user config path
+from typing import Callable
+
+log = logging.getLogger(__name__)
+
+# orjson formats large mdls results several times faster than the json
+# module. It is optional; json is used when it is missing.
+try:
+    import orjson as _json_fast
+except ImportError:
+    _json_fast = None
 
 # Attempt to import Qt bindings dynamically
 from spotlight_gui.utils.checks import check_qt_available, is_macos
 from spotlight_gui.core import commands
-from spotlight_gui.core.api_objc import get_pyobjc_helper # For icon support
-from spotlight_gui.utils.async_subprocess import get_recent_output_logs # For internal logs
+from spotlight_gui.utils.async_subprocess import get_output_logs_since # For internal logs
 
 QT_BINDING = check_qt_available()
 
 if QT_BINDING == 'PySide6':
     from PySide6.QtWidgets import (
         QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-        QTabWidget, QLineEdit, QPushButton, QCheckBox, QTreeWidget,
-        QTreeWidgetItem, QLabel, QTextEdit, QStatusBar, QDockWidget,
-        QMessageBox, QFrame, QSizePolicy, QSlider, QComboBox
+        QTabWidget, QLineEdit, QPushButton, QCheckBox, QTreeWidget, QTreeView,
+        QTreeWidgetItem, QLabel, QTextEdit, QPlainTextEdit, QStatusBar, QDockWidget,
+        QMessageBox, QFrame, QSizePolicy, QFileIconProvider
+    )
+    from PySide6.QtCore import (
+        Qt, QTimer, QThread, Slot, QSettings, QObject, QEvent, QCoreApplication,
+        QAbstractListModel, QModelIndex, QFileInfo
     )
-    from PySide6.QtCore import Qt, QTimer, QThread, Signal, Slot, QSettings
-    from PySide6.QtGui import QFont, QPalette, QColor, QTextCharFormat, QBrush, QIcon, QPixmap, QTextCursor
+    from PySide6.QtGui import QFont, QPalette, QColor, QBrush, QIcon
     from PySide6.QtWidgets import QStyle # For standard icons
 elif QT_BINDING == 'PyQt5':
     from PyQt5.QtWidgets import (
         QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-        QTabWidget, QLineEdit, QPushButton, QCheckBox, QTreeWidget,
-        QTreeWidgetItem, QLabel, QTextEdit, QStatusBar, QDockWidget,
-        QMessageBox, QFrame, QSizePolicy, QSlider, QComboBox
+        QTabWidget, QLineEdit, QPushButton, QCheckBox, QTreeWidget, QTreeView,
+        QTreeWidgetItem, QLabel, QTextEdit, QPlainTextEdit, QStatusBar, QDockWidget,
+        QMessageBox, QFrame, QSizePolicy, QFileIconProvider
     )
-    from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal as Signal, pyqtSlot as Slot, QSettings
-    from PyQt5.QtGui import QFont, QPalette, QColor, QTextCharFormat, QTextCursor, QIcon, QPixmap
+    from PyQt5.QtCore import (
+        Qt, QTimer, QThread, pyqtSlot as Slot, QSettings, QObject, QEvent, QCoreApplication,
+        QAbstractListModel, QModelIndex, QFileInfo
+    )
+    from PyQt5.QtGui import QFont, QPalette, QColor, QBrush, QIcon
     from PyQt5.QtWidgets import QStyle # For standard icons
 else:
     raise ImportError("Neither PySide6 nor PyQt5 is available. Cannot run Qt GUI.")
 
-# For macOS dark mode detection (requires PyObjC, so make it optional)
-if is_macos():
-    try:
-        from Foundation import NSUserDefaults, NSString # type: ignore
-    except ImportError:
-        NSUserDefaults = None
-else:
-    NSUserDefaults = None
+
+def _format_metadata(metadata: dict) -> str:
+    """Pretty-prints mdls metadata as sorted, indented JSON; dates and data are stringified."""
+    if _json_fast is not None:
+        return _json_fast.dumps(metadata, default=str,
+                                option=_json_fast.OPT_INDENT_2 | _json_fast.OPT_SORT_KEYS).decode('utf-8')
+    return json.dumps(metadata, indent=2, sort_keys=True, default=str)
+
+def _macos_dark_mode() -> bool:
+    """
+    Returns True if macOS is set to dark mode. AppleInterfaceStyle is read
+    straight from the global preferences plist, so no PyObjC bridge (or
+    `defaults` process) is needed.
+    """
+    import plistlib
+    path = os.path.expanduser('~/Library/Preferences/.GlobalPreferences.plist')
+    with open(path, 'rb') as f:
+        return plistlib.load(f).get('AppleInterfaceStyle') == 'Dark'
 
 
 class AsyncWorker(QThread):
@@ -67,38 +95,197 @@ class AsyncWorker(QThread):
             self.loop.call_soon_threadsafe(self.loop.stop)
         self.quit()
 
+class UiUpdateQueue:
+    """
+    The channel coroutines use to hand UI updates to the GUI thread.
+
+    Items go into a deque, whose append() and popleft() are atomic, so the
+    worker and GUI threads can share it without locks. Putting an item also
+    calls `wakeup`, unless a wake-up is already pending, so the GUI thread is
+    woken once per batch of updates instead of polling on a timer.
+    """
+    def __init__(self, wakeup: Callable[[], None]):
+        self._items = collections.deque()
+        self._wakeup = wakeup
+        self._wakeup_pending = False
+
+    def put_nowait(self, item):
+        """Queues an item from any thread."""
+        self._items.append(item)
+        # The flag is checked after the item is queued and cleared by the
+        # reader before it drains, so no item can be left without a wake-up.
+        if not self._wakeup_pending:
+            self._wakeup_pending = True
+            self._wakeup()
+
+    def drain(self, limit: int | None = None) -> list:
+        """
+        Acknowledges the wake-up and returns the queued items, at most `limit`
+        of them. If items are left over, another wake-up is requested so the
+        rest are handled after the events already waiting (e.g. repaints).
+        """
+        self._wakeup_pending = False
+        items = []
+        popleft = self._items.popleft
+        while limit is None or len(items) < limit:
+            try:
+                items.append(popleft())
+            except IndexError:
+                return items
+        if self._items and not self._wakeup_pending:
+            self._wakeup_pending = True
+            self._wakeup()
+        return items
+
+# Custom event posted to the GUI thread when UI updates are waiting.
+_UI_UPDATE_EVENT = QEvent.Type(QEvent.registerEventType())
+
+class _UiUpdateReceiver(QObject):
+    """
+    Lives on the GUI thread and calls `callback` for each posted wake-up
+    event. QCoreApplication.postEvent() is thread-safe and wakes the Qt event
+    loop directly, without a signal connection or file descriptor.
+    """
+    def __init__(self, callback: Callable[[], None], parent: QObject = None):
+        super().__init__(parent)
+        self._callback = callback
+
+    def post_wakeup(self):
+        """Schedules `callback` on the GUI thread; callable from any thread."""
+        try:
+            QCoreApplication.postEvent(self, QEvent(_UI_UPDATE_EVENT))
+        except RuntimeError:
+            pass  # Receiver already deleted during shutdown
+
+    def event(self, event):
+        if event.type() == _UI_UPDATE_EVENT:
+            self._callback()
+            return True
+        return super().event(event)
+
+class ResultsModel(QAbstractListModel):
+    """
+    Search result paths for a QTreeView. The view only asks for the rows in
+    its viewport, so icons are looked up lazily, for visible rows only,
+    instead of once per result when it arrives.
+
+    Files with an extension share one icon per extension; only extensionless
+    paths (mostly folders) are looked up individually.
+    """
+    def __init__(self, default_icon: QIcon, parent: QObject = None):
+        super().__init__(parent)
+        self._default_icon = default_icon
+        self._icon_provider = QFileIconProvider()
+        self._paths: list[str] = []
+        self._icon_cache: dict[str, QIcon] = {}  # Keyed by extension, or by path if there is none
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        path = self._paths[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return path
+        if role == Qt.DecorationRole:
+            key = os.path.splitext(path)[1].lower() or path
+            return self._icon_cache.get(key) or self._resolve(key, path)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return "File Path"
+        return None
+
+    def _resolve(self, key: str, path: str) -> QIcon:
+        icon = self._icon_provider.icon(QFileInfo(path))
+        if icon.isNull():
+            icon = self._default_icon
+        self._icon_cache[key] = icon
+        return icon
+
+    def path_at(self, row: int) -> str:
+        return self._paths[row]
+
+    def append_paths(self, paths: list):
+        """Appends rows for `paths` with a single insert notification."""
+        if not paths:
+            return
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(paths) - 1)
+        self._paths.extend(paths)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._paths.clear()
+        self._icon_cache.clear()
+        self.endResetModel()
+
 class SpotlightQtApp(QMainWindow):
     """
     Main Qt application class for the Spotlight GUI.
     Manages the UI, tabs, and bridges with the asyncio event loop
     for non-blocking command execution.
     """
-    ui_update_signal = Signal(dict)
-    add_tree_item_signal = Signal(QTreeWidgetItem)
-
-    def __init__(self, loop: asyncio.AbstractEventLoop):
+    # Live search delay after the first keystroke following a pause, and
+    # while keystrokes keep arriving before the search has started.
+    SEARCH_DEBOUNCE_IDLE_MS = 200
+    SEARCH_DEBOUNCE_TYPING_MS = 750
+    # Search results beyond this many rows wait behind a "Show More" button.
+    MAX_RESULT_ROWS = 5000
+    # Most queued UI updates handled per wake-up, so a burst cannot hold off
+    # repaints and input for long.
+    MAX_UI_UPDATES_PER_TICK = 256
+    # Minimum gap between status bar repaints (at most 10 per second).
+    STATUS_MIN_INTERVAL_MS = 100
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, run_loop_in_thread: bool = True):
+        """
+        Args:
+            loop: The asyncio event loop used for command execution.
+            run_loop_in_thread: If True, `loop` is run in an AsyncWorker thread.
+                                Pass False when the loop is already driven by the
+                                Qt event loop (e.g. PySide6.QtAsyncio).
+        """
         super().__init__()
         self.loop = loop
-        self.async_worker_thread = AsyncWorker(self.loop)
-        self.async_worker_thread.start()
+        self.async_worker_thread = None
+        if run_loop_in_thread:
+            self.async_worker_thread = AsyncWorker(self.loop)
+            self.async_worker_thread.start()
 
         self.setWindowTitle(f"Spotlight GUI ({QT_BINDING})")
         self.setGeometry(100, 100, 1200, 800)
 
-        self.objc_helper = get_pyobjc_helper()
         self.settings = QSettings("com.yourcompany", "SpotlightGUI")
 
+        # Shared by every search result row.
+        self._default_file_icon = QApplication.style().standardIcon(QStyle.SP_FileIcon)
+        # (second, "HH:MM:SS") of the last status timestamp, reused within that second.
+        self._last_timestamp = (None, "")
+
+        # Status messages arriving faster than STATUS_MIN_INTERVAL_MS wait
+        # here; only the latest one is shown when the interval ends.
+        self._pending_status = None
+        self._status_throttle_timer = QTimer(self)
+        self._status_throttle_timer.setSingleShot(True)
+        self._status_throttle_timer.setInterval(self.STATUS_MIN_INTERVAL_MS)
+        self._status_throttle_timer.timeout.connect(self._flush_pending_status)
+
         self._search_debounce_timer = QTimer(self)
         self._search_debounce_timer.setSingleShot(True)
-        self._search_debounce_timer.setInterval(500)
+        self._search_debounce_timer.setInterval(self.SEARCH_DEBOUNCE_IDLE_MS)
         self._search_debounce_timer.timeout.connect(self._perform_live_search)
 
         self.live_search_task = None
         self.log_streaming_task = None
         self.active_streaming_tasks = []
 
-        self._setup_ui()
+        # The bridge comes first: building the UI already queues status updates.
         self._setup_asyncio_bridge()
+        self._setup_ui()
 
         self.restoreGeometry(self.settings.value("geometry", b""))
         self.restoreState(self.settings.value("windowState", b""))
@@ -112,12 +299,23 @@ class SpotlightQtApp(QMainWindow):
         self.tab_widget = QTabWidget(self)
         self.main_layout.addWidget(self.tab_widget)
 
-        self._create_search_tab()
-        self._create_query_builder_tab()
-        self._create_metadata_viewer_tab()
-        self._create_index_management_tab()
-        self._create_debug_tab()
-        self._create_preferences_tab()
+        self.tab_widget.addTab(self._create_search_tab(), "Search")
+        # The other tabs start as empty pages and are built the first time
+        # they are shown, so startup does not pay for them (or for the
+        # volume listing the Index Management tab runs when built).
+        self._tab_builders = {}
+        for title, builder in (("Query Builder", self._create_query_builder_tab),
+                               ("Metadata Viewer", self._create_metadata_viewer_tab),
+                               ("Index Management", self._create_index_management_tab),
+                               ("Debug", self._create_debug_tab),
+                               ("Preferences", self._create_preferences_tab)):
+            page = QWidget()
+            QVBoxLayout(page).setContentsMargins(0, 0, 0, 0)
+            index = self.tab_widget.addTab(page, title)
+            self._tab_builders[index] = builder
+            if builder == self._create_metadata_viewer_tab:
+                self.metadata_tab_index = index
+        self.tab_widget.currentChanged.connect(self._ensure_tab_built)
         self._create_console_dock()
 
         self.status_bar = QStatusBar(self)
@@ -126,6 +324,12 @@ class SpotlightQtApp(QMainWindow):
 
         self._apply_mac_styling()
 
+    @Slot(int)
+    def _ensure_tab_built(self, index: int):
+        builder = self._tab_builders.pop(index, None)
+        if builder is not None:
+            self.tab_widget.widget(index).layout().addWidget(builder())
+
     def _apply_mac_styling(self):
         if not is_macos():
             print("Not on macOS. Using default Qt theme.")
@@ -134,14 +338,8 @@ class SpotlightQtApp(QMainWindow):
         font = QFont("SF Pro Text", 12) if sys.platform == 'darwin' else QFont()
         QApplication.setFont(font)
         
-        if not NSUserDefaults:
-            print("PyObjC not available. Using default Qt theme.")
-            return
-        
         try:
-            user_defaults = NSUserDefaults.standardUserDefaults()
-            interface_style = user_defaults.stringForKey_("AppleInterfaceStyle")
-            if interface_style == "Dark":
+            if _macos_dark_mode():
                 print("Detected macOS dark mode. Applying dark palette.")
                 palette = QPalette()
                 palette.setColor(QPalette.Window, QColor(53, 53, 53))
@@ -160,80 +358,103 @@ class SpotlightQtApp(QMainWindow):
                 self.setPalette(palette)
                 QApplication.setPalette(palette)
         except Exception as e:
-            print(f"Error detecting macOS dark mode with PyObjC: {e}")
+            print(f"Error detecting macOS dark mode: {e}")
 
     def _setup_asyncio_bridge(self):
-        self.ui_update_signal.connect(self._process_ui_update)
-        self.add_tree_item_signal.connect(self._process_add_tree_item)
-        self.ui_update_queue = asyncio.Queue()
-
-        self.queue_check_timer = QTimer(self)
-        self.queue_check_timer.timeout.connect(self._check_asyncio_queue)
-        self.queue_check_timer.start(100)
-
-    @Slot(dict)
-    def _process_ui_update(self, item: dict):
-        item_type = item.get("type")
-        data = item.get("data")
-
-        if item_type == "search_result" and self.live_search_checkbox.isChecked():
-            if data and os.path.exists(data):
-                self._add_task(self._add_search_result_item(data))
-        elif item_type == "log_stream_result":
-            if "error" in data.lower():
-                self._append_text_with_color(self.spotlight_log_text, data, QColor("red"))
-            elif "warning" in data.lower():
-                self._append_text_with_color(self.spotlight_log_text, data, QColor("orange"))
+        # Handlers for the update types applied one item at a time. Search
+        # results are grouped per batch instead, in _process_ui_updates.
+        # Widgets of lazily built tabs are looked up when the handler runs,
+        # not here.
+        self._ui_handlers = {
+            "console_stream_result": lambda data: self.console_output_text.appendPlainText(data),
+            # Plain text: skips rich-text detection on large mdls dumps.
+            "metadata_result": lambda data: self.metadata_text_edit.setPlainText(data),
+            "volume_list": self._set_volume_list,
+            "index_status": lambda data: self.index_status_label.setText(data),
+            "progress_update": lambda data: self.index_progress_label.setText(data),
+            "status_update": self._show_status_message,
+            "status_error": self._show_error_message,
+        }
+        # Queuing an update posts one wake-up event to the GUI thread, which
+        # then drains everything queued by that time.
+        self._ui_update_receiver = _UiUpdateReceiver(self._check_asyncio_queue, self)
+        self.ui_update_queue = UiUpdateQueue(self._ui_update_receiver.post_wakeup)
+
+    def _process_ui_updates(self, items: list):
+        """
+        Applies a batch of UI updates. Search results from the whole batch are
+        collected and inserted into the results tree with a single call.
+        """
+        search_paths = []
+        for item in items:
+            item_type = item.get("type")
+            data = item.get("data")
+            if item_type == "live_search_results":
+                # mdfind only reports existing files, so the paths are not
+                # stat()ed again here on the GUI thread.
+                if self.live_search_checkbox.isChecked():
+                    search_paths.extend(data)
+            elif item_type == "search_results":
+                search_paths.extend(data)
             else:
-                self.spotlight_log_text.append(data)
-        elif item_type == "console_stream_result":
-            self.console_output_text.append(data)
-        elif item_type == "metadata_result":
-            self.metadata_text_edit.setText(data)
-        elif item_type == "index_status":
-            self.index_status_label.setText(data)
-        elif item_type == "progress_update":
-            self.index_progress_label.setText(data)
-        elif item_type == "log_refresh_result":
-            self.spotlight_log_text.setText(data)
-        elif item_type == "status_update":
-            self.status_bar.showMessage(f"{datetime.datetime.now().strftime('%H:%M:%S')} - {data}")
-        elif item_type == "status_error":
-            self.status_bar.showMessage(f"{datetime.datetime.now().strftime('%H:%M:%S')} - ERROR: {data}", 5000)
-            QMessageBox.critical(self, "Error", data)
-
-    def _append_text_with_color(self, text_edit: QTextEdit, text: str, color: QColor):
-        cursor = text_edit.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        text_edit.setTextCursor(cursor)
-        
-        char_format = QTextCharFormat()
-        char_format.setForeground(QBrush(color))
-        cursor.insertText(text + "\n", char_format)
+                handler = self._ui_handlers.get(item_type)
+                if handler is not None:
+                    handler(data)
+        if search_paths:
+            self._add_search_result_items(search_paths)
+
+    def _show_status_message(self, message: str):
+        if self._status_throttle_timer.isActive():
+            # Bursts (e.g. from log streaming) only need the latest message.
+            self._pending_status = message
+            return
+        self.status_bar.showMessage(f"{self._timestamp()} - {message}")
+        self._status_throttle_timer.start()
+
+    @Slot()
+    def _flush_pending_status(self):
+        if self._pending_status is not None:
+            message, self._pending_status = self._pending_status, None
+            self._show_status_message(message)
+
+    def _show_error_message(self, message: str):
+        # Errors are never throttled, and supersede any waiting status message.
+        self._pending_status = None
+        self.status_bar.showMessage(f"{self._timestamp()} - ERROR: {message}", 5000)
+        self._status_throttle_timer.start()
+        QMessageBox.critical(self, "Error", message)
+
+    def _timestamp(self) -> str:
+        """Returns the current time as HH:MM:SS, formatted at most once per second."""
+        second = int(time.time())
+        if second != self._last_timestamp[0]:
+            self._last_timestamp = (second, datetime.datetime.fromtimestamp(second).strftime('%H:%M:%S'))
+        return self._last_timestamp[1]
 
     def _check_asyncio_queue(self):
-        while not self.ui_update_queue.empty():
-            try:
-                item = self.ui_update_queue.get_nowait()
-                self.ui_update_signal.emit(item)
-            except asyncio.QueueEmpty:
-                break
+        items = self.ui_update_queue.drain(self.MAX_UI_UPDATES_PER_TICK)
+        if items:
+            self._process_ui_updates(items)
 
     def _add_task(self, coro):
+        if self.async_worker_thread is None:
+            # The loop runs on this (GUI) thread; no cross-thread hop needed.
+            return self.loop.create_task(coro)
         return asyncio.run_coroutine_threadsafe(coro, self.loop)
 
     def _show_status(self, message: str):
-        self.ui_update_signal.emit({"type": "status_update", "data": message})
-        print(f"[STATUS] {message}")
+        self.ui_update_queue.put_nowait({"type": "status_update", "data": message})
+        # Logged rather than printed: status messages are frequent while
+        # streaming, and INFO is filtered out unless SPOTLIGHT_DEBUG is set.
+        log.info("[STATUS] %s", message)
 
     def _show_error(self, message: str, title: str = "Error"):
-        self.ui_update_signal.emit({"type": "status_error", "data": message})
-        print(f"[ERROR] {message}", file=sys.stderr)
+        self.ui_update_queue.put_nowait({"type": "status_error", "data": message})
+        log.error("%s", message)
 
     def _create_search_tab(self):
         search_widget = QWidget()
         search_layout = QVBoxLayout(search_widget)
-        self.tab_widget.addTab(search_widget, "Search")
 
         input_frame = QFrame()
         input_layout = QHBoxLayout(input_frame)
@@ -254,18 +475,32 @@ class SpotlightQtApp(QMainWindow):
         self.search_button.setEnabled(False)
         input_layout.addWidget(self.search_button)
 
-        self.search_results_tree = QTreeWidget(self)
-        self.search_results_tree.setHeaderLabels(["Icon", "File Path"])
-        self.search_results_tree.setColumnWidth(0, 40)
+        self.search_results_model = ResultsModel(self._default_file_icon, self)
+        self.search_results_tree = QTreeView(self)
+        self.search_results_tree.setModel(self.search_results_model)
+        self.search_results_tree.setRootIsDecorated(False)
+        self.search_results_tree.setUniformRowHeights(True)
         self.search_results_tree.header().setStretchLastSection(True)
-        self.search_results_tree.itemSelectionChanged.connect(self._on_result_select)
+        self.search_results_tree.selectionModel().selectionChanged.connect(self._on_result_select)
         search_layout.addWidget(self.search_results_tree)
 
+        self._hidden_result_paths = []
+        self.more_results_button = QPushButton(self)
+        self.more_results_button.clicked.connect(self._show_more_results)
+        self.more_results_button.hide()
+        search_layout.addWidget(self.more_results_button)
+
         self._on_search_input_changed()
+        return search_widget
 
     @Slot()
     def _on_search_input_changed(self):
         if self.live_search_checkbox.isChecked():
+            # A keystroke while a search is still pending means the user is
+            # typing; wait longer so the burst starts a single mdfind.
+            typing = self._search_debounce_timer.isActive()
+            self._search_debounce_timer.setInterval(
+                self.SEARCH_DEBOUNCE_TYPING_MS if typing else self.SEARCH_DEBOUNCE_IDLE_MS)
             self._search_debounce_timer.start()
 
     @Slot()
@@ -276,7 +511,7 @@ class SpotlightQtApp(QMainWindow):
             self.live_search_task.cancel()
             self._show_status("Live search cancelled (new query).")
 
-        self.search_results_tree.clear()
+        self._clear_search_results()
 
         if not query:
             self._show_status("Live search: Query is empty.")
@@ -284,18 +519,21 @@ class SpotlightQtApp(QMainWindow):
 
         self._show_status(f"Starting live mdfind for: '{query}'...")
         
-        def _live_callback(line: str):
-            asyncio.run_coroutine_threadsafe(self.ui_update_queue.put({"type": "search_result", "data": line}), self.loop)
+        def _live_callback(lines):
+            # Called with a batch of paths, which is queued as one update.
+            # The queue is thread-safe, so this works whichever thread runs
+            # the event loop.
+            self.ui_update_queue.put_nowait({"type": "live_search_results", "data": lines})
 
         async def _run_live_search():
             try:
-                await commands.mdfind(query, live=True, output_callback=_live_callback)
+                await commands.mdfind(query, live=True, bulk_callback=_live_callback)
             except asyncio.CancelledError:
                 self._show_status("Live search task explicitly cancelled.")
             except commands.CommandError as e:
-                await self.ui_update_queue.put({"type": "status_error", "data": f"Live search failed: {e.stderr or e.stdout or e.message}"})
+                self.ui_update_queue.put_nowait({"type": "status_error", "data": f"Live search failed: {e.stderr or e.stdout or e.message}"})
             except Exception as e:
-                await self.ui_update_queue.put({"type": "status_error", "data": f"An unexpected error occurred during live search: {e}"})
+                self.ui_update_queue.put_nowait({"type": "status_error", "data": f"An unexpected error occurred during live search: {e}"})
             finally:
                 if self.live_search_task in self.active_streaming_tasks:
                     self.active_streaming_tasks.remove(self.live_search_task)
@@ -303,33 +541,52 @@ class SpotlightQtApp(QMainWindow):
         self.live_search_task = self._add_task(_run_live_search())
         self.active_streaming_tasks.append(self.live_search_task)
 
-    async def _add_search_result_item(self, path: str):
-        item = QTreeWidgetItem(["", path])
-        icon = QApplication.style().standardIcon(QStyle.SP_FileIcon)
+    def _clear_search_results(self):
+        self.search_results_model.clear()
+        self._hidden_result_paths.clear()
+        self._update_more_results_button()
+
+    def _add_search_result_items(self, paths: list):
+        # Only the first MAX_RESULT_ROWS results go into the model; the rest
+        # wait until asked for, so a huge result set does not grow the view
+        # by rows nobody scrolls to.
+        if not self._hidden_result_paths:
+            room = max(self.MAX_RESULT_ROWS - self.search_results_model.rowCount(), 0)
+            self.search_results_model.append_paths(paths[:room])
+            paths = paths[room:]
+        if paths:
+            self._hidden_result_paths.extend(paths)
+            self._update_more_results_button()
 
-        if self.objc_helper and os.path.exists(path):
-            file_info = self.objc_helper.file_info(path)
-            if file_info.get("has_icon"):
-                # Simplified: In a real app, convert NSImage to QPixmap
-                pass
-        item.setIcon(0, icon)
-        self.add_tree_item_signal.emit(item)
+    @Slot()
+    def _show_more_results(self):
+        batch = self._hidden_result_paths[:self.MAX_RESULT_ROWS]
+        del self._hidden_result_paths[:self.MAX_RESULT_ROWS]
+        self.search_results_model.append_paths(batch)
+        self._update_more_results_button()
 
-    @Slot(QTreeWidgetItem)
-    def _process_add_tree_item(self, item: QTreeWidgetItem):
-        self.search_results_tree.addTopLevelItem(item)
+    def _update_more_results_button(self):
+        hidden = len(self._hidden_result_paths)
+        self.more_results_button.setText(f"Show More Results ({hidden} not shown)")
+        self.more_results_button.setVisible(hidden > 0)
 
     @Slot(int)
     def _on_live_search_toggle(self, state):
-        is_checked = (state == Qt.Checked)
+        # Read the checkbox itself: PySide6 passes `state` as a plain int,
+        # which never compares equal to the Qt.Checked enum.
+        is_checked = self.live_search_checkbox.isChecked()
         self.search_button.setEnabled(not is_checked)
         if is_checked:
+            self.search_entry.textChanged.connect(self._on_search_input_changed)
             self._on_search_input_changed()
         else:
+            # Keystrokes need no handling while live search is off.
+            self.search_entry.textChanged.disconnect(self._on_search_input_changed)
+            self._search_debounce_timer.stop()
             if self.live_search_task and not self.live_search_task.done():
                 self.live_search_task.cancel()
             self._show_status("Live search disabled.")
-            self.search_results_tree.clear()
+            self._clear_search_results()
 
     @Slot()
     def _perform_static_search(self):
@@ -342,15 +599,14 @@ class SpotlightQtApp(QMainWindow):
             self.live_search_task.cancel()
             self._show_status("Live search stopped for static search.")
 
-        self.search_results_tree.clear()
+        self._clear_search_results()
         self._add_task(self._do_mdfind_static_search(query))
 
     async def _do_mdfind_static_search(self, query: str):
         self._show_status(f"Performing static mdfind for: '{query}'...")
         try:
             results = await commands.mdfind(query, live=False)
-            for path in results:
-                await self._add_search_result_item(path)
+            self.ui_update_queue.put_nowait({"type": "search_results", "data": results})
             self._show_status(f"Found {len(results)} results for '{query}'.")
         except commands.CommandError as e:
             self._show_error(f"Search failed: {e.stderr or e.stdout or e.message}")
@@ -361,24 +617,23 @@ class SpotlightQtApp(QMainWindow):
 
     @Slot()
     def _on_result_select(self):
-        selected_items = self.search_results_tree.selectedItems()
-        if selected_items:
-            item_path = selected_items[0].text(1)
-            self.tab_widget.setCurrentWidget(self.metadata_widget)
+        selected_rows = self.search_results_tree.selectionModel().selectedRows()
+        if selected_rows:
+            item_path = self.search_results_model.path_at(selected_rows[0].row())
+            self.tab_widget.setCurrentIndex(self.metadata_tab_index)
             self._add_task(self._do_mdls(item_path))
 
     def _create_query_builder_tab(self):
         self.query_builder_widget = QWidget()
         layout = QVBoxLayout(self.query_builder_widget)
-        self.tab_widget.addTab(self.query_builder_widget, "Query Builder")
         layout.addWidget(QLabel("<h2>Advanced Query Builder (Demonstration)</h2>"))
         layout.addWidget(QLabel("This is a placeholder for a more advanced query builder UI."))
         layout.addStretch()
+        return self.query_builder_widget
 
     def _create_metadata_viewer_tab(self):
         self.metadata_widget = QWidget()
         metadata_layout = QVBoxLayout(self.metadata_widget)
-        self.tab_widget.addTab(self.metadata_widget, "Metadata Viewer")
 
         input_frame = QFrame()
         input_layout = QHBoxLayout(input_frame)
@@ -397,22 +652,27 @@ class SpotlightQtApp(QMainWindow):
         self.metadata_text_edit.setReadOnly(True)
         self.metadata_text_edit.setFont(QFont("Monaco", 11))
         metadata_layout.addWidget(self.metadata_text_edit)
+        return self.metadata_widget
 
     async def _do_mdls(self, path: str):
         if not path: return
         self.metadata_path_entry.setText(path)
-        await self.ui_update_queue.put({"type": "metadata_result", "data": f"Fetching metadata for: {path}..."})
+        self.ui_update_queue.put_nowait({"type": "metadata_result", "data": f"Fetching metadata for: {path}..."})
         try:
             metadata = await commands.mdls(path)
-            formatted_metadata = json.dumps(metadata, indent=2, sort_keys=True) if metadata else f"No metadata found for '{path}'."
-            await self.ui_update_queue.put({"type": "metadata_result", "data": formatted_metadata})
+            if metadata:
+                # Pretty-printing a large dict is CPU-bound; keep it off the
+                # event loop, which may be the GUI thread under qasync.
+                formatted_metadata = await asyncio.to_thread(_format_metadata, metadata)
+            else:
+                formatted_metadata = f"No metadata found for '{path}'."
+            self.ui_update_queue.put_nowait({"type": "metadata_result", "data": formatted_metadata})
         except commands.CommandError as e:
-            await self.ui_update_queue.put({"type": "status_error", "data": f"Metadata fetch failed: {e.message}"})
+            self.ui_update_queue.put_nowait({"type": "status_error", "data": f"Metadata fetch failed: {e.message}"})
 
     def _create_index_management_tab(self):
         index_mgmt_widget = QWidget()
         layout = QVBoxLayout(index_mgmt_widget)
-        self.tab_widget.addTab(index_mgmt_widget, "Index Management")
 
         volume_list_group_box = QFrame(self); volume_list_group_box.setFrameShape(QFrame.StyledPanel)
         volume_list_layout = QVBoxLayout(volume_list_group_box)
@@ -423,6 +683,12 @@ class SpotlightQtApp(QMainWindow):
         self.volume_list_tree.setHeaderLabels(["Volume Path", "Indexing Status"])
         self.volume_list_tree.setColumnWidth(0, 300)
         self.volume_list_tree.itemSelectionChanged.connect(self._on_volume_select)
+        # Status is fetched once selection settles, so arrowing through the
+        # list does not start a status query per row passed.
+        self._volume_status_timer = QTimer(self)
+        self._volume_status_timer.setSingleShot(True)
+        self._volume_status_timer.setInterval(150)
+        self._volume_status_timer.timeout.connect(lambda: self._add_task(self._do_mdutil_status()))
         volume_list_layout.addWidget(self.volume_list_tree)
         refresh_volumes_btn = QPushButton("Refresh Volumes", self)
         refresh_volumes_btn.clicked.connect(lambda: self._add_task(self._do_list_volumes()))
@@ -449,42 +715,51 @@ class SpotlightQtApp(QMainWindow):
 
         layout.addStretch()
         self._add_task(self._do_list_volumes())
+        return index_mgmt_widget
 
     async def _do_list_volumes(self):
         self._show_status("Listing all indexed volumes...")
-        self.volume_list_tree.clear()
         try:
+            # One mdutil run covers every volume; the statuses it caches also
+            # answer _do_mdutil_status when a volume is selected shortly after.
             volumes = await commands.list_indexed_volumes()
-            for vol_info in volumes:
-                path = vol_info.get('volume', 'N/A')
-                status_str = f"Indexing {vol_info.get('state', 'unknown')}"
-                if 'error' in vol_info: status_str += f" (Error: {vol_info['error']})"
-                
-                item = QTreeWidgetItem([path, status_str])
-                if vol_info.get('state') == 'restricted':
-                    item.setForeground(0, QBrush(QColor("red")))
-                    item.setForeground(1, QBrush(QColor("red")))
-                self.volume_list_tree.addTopLevelItem(item)
+            self.ui_update_queue.put_nowait({"type": "volume_list", "data": volumes})
             self._show_status(f"Found {len(volumes)} volumes.")
         except Exception as e:
             self._show_error(f"Failed to list volumes: {e}")
 
+    def _set_volume_list(self, volumes: list):
+        restricted_brush = QBrush(QColor("red"))
+        items = []
+        for vol_info in volumes:
+            path = vol_info.get('volume', 'N/A')
+            status_str = f"Indexing {vol_info.get('state', 'unknown')}"
+            if 'error' in vol_info: status_str += f" (Error: {vol_info['error']})"
+
+            item = QTreeWidgetItem([path, status_str])
+            if vol_info.get('state') == 'restricted':
+                item.setForeground(0, restricted_brush)
+                item.setForeground(1, restricted_brush)
+            items.append(item)
+        self.volume_list_tree.clear()
+        self.volume_list_tree.addTopLevelItems(items)
+
     @Slot()
     def _on_volume_select(self):
         selected_items = self.volume_list_tree.selectedItems()
         if selected_items:
             volume_path = selected_items[0].text(0)
             self.volume_path_entry.setText(volume_path)
-            self._add_task(self._do_mdutil_status())
+            self._volume_status_timer.start()
 
     async def _do_mdutil_status(self):
         volume_path = self.volume_path_entry.text()
-        await self.ui_update_queue.put({"type": "index_status", "data": f"Status: Fetching for {volume_path}..."})
+        self.ui_update_queue.put_nowait({"type": "index_status", "data": f"Status: Fetching for {volume_path}..."})
         try:
             status = await commands.mdutil_status(volume_path)
-            await self.ui_update_queue.put({"type": "index_status", "data": f"Status: Indexing is {status['state']}."})
+            self.ui_update_queue.put_nowait({"type": "index_status", "data": f"Status: Indexing is {status['state']}."})
         except (commands.CommandError, commands.SystemCheckError) as e:
-            await self.ui_update_queue.put({"type": "index_status", "data": f"Status: Error - {e}"})
+            self.ui_update_queue.put_nowait({"type": "index_status", "data": f"Status: Error - {e}"})
 
     async def _do_mdutil_action(self, action: str):
         volume_path = self.volume_path_entry.text()
@@ -500,19 +775,25 @@ class SpotlightQtApp(QMainWindow):
         # Simplified for brevity
         debug_widget = QWidget()
         layout = QVBoxLayout(debug_widget)
-        self.tab_widget.addTab(debug_widget, "Debug")
         layout.addWidget(QLabel("<h2>Debug Tools</h2>"))
         layout.addWidget(QLabel("Internal App Command Logs:"))
-        self.app_log_text = QTextEdit(self); self.app_log_text.setReadOnly(True)
+        # Plain text, appended to on each refresh and capped, so the pane
+        # never reformats the whole log.
+        self.app_log_text = QPlainTextEdit(self); self.app_log_text.setReadOnly(True)
+        self.app_log_text.setMaximumBlockCount(10000)
+        self._app_log_position = 0
         layout.addWidget(self.app_log_text)
         refresh_btn = QPushButton("Refresh Internal Logs", self)
         refresh_btn.clicked.connect(self._refresh_internal_logs)
         layout.addWidget(refresh_btn)
         self._refresh_internal_logs()
+        return debug_widget
 
     @Slot()
     def _refresh_internal_logs(self):
-        self.app_log_text.setText("\n".join(get_recent_output_logs()))
+        entries, self._app_log_position = get_output_logs_since(self._app_log_position)
+        if entries:
+            self.app_log_text.appendPlainText("\n".join(entries))
         self.app_log_text.verticalScrollBar().setValue(self.app_log_text.verticalScrollBar().maximum())
 
     def _create_console_dock(self):
@@ -523,17 +804,21 @@ class SpotlightQtApp(QMainWindow):
         layout = QVBoxLayout(console_widget)
         self.console_dock.setWidget(console_widget)
         layout.addWidget(QLabel("Execute whitelisted commands (mdfind, mdutil, mdls, log, plutil)"))
-        self.console_output_text = QTextEdit(self); self.console_output_text.setReadOnly(True)
+        # Plain text with a block cap: old lines are dropped as new ones
+        # stream in, instead of the document growing without bound.
+        self.console_output_text = QPlainTextEdit(self); self.console_output_text.setReadOnly(True)
+        self.console_output_text.setMaximumBlockCount(5000)
+        self.console_output_text.setUndoRedoEnabled(False)
         layout.addWidget(self.console_output_text)
 
     def _create_preferences_tab(self):
         # Simplified for brevity
         preferences_widget = QWidget()
         layout = QVBoxLayout(preferences_widget)
-        self.tab_widget.addTab(preferences_widget, "Preferences")
         layout.addWidget(QLabel("<h2>Preferences</h2>"))
         layout.addWidget(QLabel("UI settings (window size, position) are saved automatically on exit."))
         layout.addStretch()
+        return preferences_widget
 
     def closeEvent(self, event):
         self.settings.setValue("geometry", self.saveGeometry())
@@ -541,13 +826,12 @@ class SpotlightQtApp(QMainWindow):
         self.settings.setValue("last_selected_tab", self.tab_widget.currentIndex())
         
         self._show_status("Shutting down...")
-        self.queue_check_timer.stop()
 
         for task in self.active_streaming_tasks:
             if not task.done():
                 task.cancel()
 
-        if self.async_worker_thread.isRunning():
+        if self.async_worker_thread is not None and self.async_worker_thread.isRunning():
             self.async_worker_thread.stop()
             self.async_worker_thread.wait(5000) # Wait up to 5s for thread to finish
 
@@ -1,4 +1,5 @@
 import asyncio
+import logging
 import tkinter
 from tkinter import ttk
 import os
@@ -7,6 +8,8 @@ import sys
 from spotlight_gui.core import commands as spotlight_cmds
 from spotlight_gui.utils.checks import is_macos
 
+log = logging.getLogger(__name__)
+
 class TkinterApp(tkinter.Tk):
     """
     Tkinter application wrapper for the Spotlight GUI.
@@ -42,7 +45,7 @@ class TkinterApp(tkinter.Tk):
                 self.tk.call("source", theme_path)
                 # For now, we default to the light theme. A preference could be added later.
                 self.tk.call("set_theme", "light")
-                print("[DEBUG] Sun Valley theme loaded successfully.")
+                log.debug("Sun Valley theme loaded successfully.")
             except tkinter.TclError as e:
                 print(f"WARNING: Could not apply Sun Valley theme: {e}", file=sys.stderr)
         else:
@@ -132,7 +135,7 @@ class TkinterApp(tkinter.Tk):
 
     def _on_closing(self):
         """Handles window close event to shut down gracefully."""
-        print("[DEBUG] Tkinter window closing...")
+        log.debug("Tkinter window closing...")
         if hasattr(self, '_poll_id'):
             self.after_cancel(self._poll_id)
         
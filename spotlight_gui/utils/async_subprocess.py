@@ -3,9 +3,35 @@ import asyncio
 import os
 import sys
 import collections
+import functools
+import itertools
+import shutil
+import signal
 
 # Using a deque for recent output for debugging/logging purposes
 _recent_output = collections.deque(maxlen=100) # Store last 100 lines of any command output
+_recent_output_count = 0 # Entries recorded since startup, including ones since dropped
+
+def _record_output(entry: str) -> None:
+    """Adds an entry to the recent-output log."""
+    global _recent_output_count
+    _recent_output.append(entry)
+    _recent_output_count += 1
+
+@functools.lru_cache(maxsize=None)
+def _resolve_executable(name: str) -> str:
+    """
+    Returns the absolute path of a command, looked up on PATH once and cached,
+    so repeated spawns of mdfind/mdutil/mdls/log skip the per-exec PATH search.
+    Names that cannot be resolved are returned unchanged.
+    """
+    if os.sep in name:
+        return name
+    return shutil.which(name) or name
+
+def _command_text(command) -> str:
+    """Formats an argv list, whose items may be str or bytes, for logs and error messages."""
+    return ' '.join(os.fsdecode(arg) for arg in command)
 
 async def _read_stream(stream, callback):
     """Helper to read a stream line by line and call a callback."""
@@ -14,18 +40,44 @@ async def _read_stream(stream, callback):
         if not line_bytes:
             break
         line = line_bytes.decode('utf-8', errors='replace').strip()
-        _recent_output.append(line) # Store for debugging
+        _record_output(line) # Store for debugging
         await callback(line)
 
-async def run_command_async(command: list[str], timeout: float = 60.0) -> tuple[int, str, str]:
+# Default time limit for one-shot commands, in seconds. Read at call time, so
+# it can be changed at runtime.
+DEFAULT_TIMEOUT = 60.0
+
+async def _kill_process_group(proc) -> None:
+    """
+    Kills a process started with start_new_session=True together with any
+    children it spawned (its session's process group), then reaps it so no
+    zombie is left behind.
+    """
+    if proc.returncode is not None:
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+    await proc.wait()
+
+async def run_command_async(command: list[str | bytes], timeout: float = None,
+                            text: bool = True) -> tuple[int, str | bytes, str]:
     """
     Runs an external command asynchronously using asyncio.subprocess.
     Captures stdout and stderr.
 
     Args:
         command: A list of strings representing the command and its arguments.
-                 Example: ['mdfind', '-name', 'test.txt']
+                 Example: ['mdfind', '-name', 'test.txt']. Arguments may also be
+                 bytes (e.g. os.fsencode()d paths); they are passed through as-is.
         timeout: Maximum time in seconds to wait for the command to complete.
+                 Defaults to DEFAULT_TIMEOUT.
+        text: If False, stdout is returned as the raw, unstripped bytes read
+              from the pipe instead of being decoded. stderr is always decoded.
 
     Returns:
         A tuple: (return_code, stdout_output, stderr_output)
@@ -34,43 +86,60 @@ async def run_command_async(command: list[str], timeout: float = 60.0) -> tuple[
         asyncio.TimeoutError: If the command does not complete within the timeout.
         FileNotFoundError: If the command executable is not found.
     """
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUT
     proc = None
     try:
+        # Each command gets its own session (and process group), so a timeout
+        # or cancellation can kill it together with anything it spawned.
         proc = await asyncio.create_subprocess_exec(
-            *command,
+            _resolve_executable(os.fsdecode(command[0])), *command[1:],
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True
         )
 
-        stdout_data, stderr_data = await asyncio.wait_for(
-            proc.communicate(), timeout=timeout
-        )
+        try:
+            stdout_data, stderr_data = await asyncio.wait_for(
+                proc.communicate(), timeout=timeout
+            )
+        except asyncio.CancelledError:
+            await _kill_process_group(proc)
+            raise
 
-        stdout_str = stdout_data.decode('utf-8', errors='replace').strip()
         stderr_str = stderr_data.decode('utf-8', errors='replace').strip()
+        if text:
+            stdout_out = stdout_data.decode('utf-8', errors='replace').strip()
+            stdout_preview = stdout_out[:100]
+        else:
+            stdout_out = stdout_data
+            stdout_preview = stdout_data[:100].decode('utf-8', errors='replace').strip()
 
-        _recent_output.append(f"[CMD] {' '.join(command)}")
-        if stdout_str: _recent_output.append(f"[STDOUT] {stdout_str[:100]}...")
-        if stderr_str: _recent_output.append(f"[STDERR] {stderr_str[:100]}...")
-        _recent_output.append(f"[RET] {proc.returncode}")
+        _record_output(f"[CMD] {_command_text(command)}")
+        if stdout_preview: _record_output(f"[STDOUT] {stdout_preview}...")
+        if stderr_str: _record_output(f"[STDERR] {stderr_str[:100]}...")
+        _record_output(f"[RET] {proc.returncode}")
 
-        return proc.returncode, stdout_str, stderr_str
+        return proc.returncode, stdout_out, stderr_str
 
     except FileNotFoundError:
-        err_msg = f"Command not found: '{command[0]}'. Please ensure it's in your system's PATH."
+        err_msg = f"Command not found: '{os.fsdecode(command[0])}'. Please ensure it's in your system's PATH."
         if sys.platform != 'darwin':
             err_msg += " This application is designed for macOS and relies on macOS-specific tools."
         raise FileNotFoundError(err_msg)
     except asyncio.TimeoutError:
-        if proc and proc.returncode is None: # Still running
-            proc.kill()
-            await proc.wait() # Wait for termination
-        raise asyncio.TimeoutError(f"Command '{' '.join(command)}' timed out after {timeout} seconds.")
+        if proc: # Still running
+            await _kill_process_group(proc)
+        raise asyncio.TimeoutError(f"Command '{_command_text(command)}' timed out after {timeout} seconds.")
     except Exception as e:
-        raise RuntimeError(f"An unexpected error occurred while running command '{' '.join(command)}': {e}")
+        raise RuntimeError(f"An unexpected error occurred while running command '{_command_text(command)}': {e}")
 
-async def run_streaming_command_async(command: list[str], output_callback: callable,
-                                      error_callback: callable = None, timeout: float = None) -> int:
+# asyncio's default StreamReader limit (64 KiB); also the longest line readline() accepts.
+DEFAULT_STREAM_LIMIT = 2 ** 16
+
+async def run_streaming_command_async(command: list[str | bytes], output_callback: callable,
+                                      error_callback: callable = None, timeout: float = None,
+                                      limit: int = DEFAULT_STREAM_LIMIT) -> int:
     """
     Runs an external command asynchronously and streams its stdout/stderr.
     The output_callback is called for each line of stdout.
@@ -82,6 +151,8 @@ async def run_streaming_command_async(command: list[str], output_callback: calla
         error_callback: An async callable `(line: str)` for stderr lines. Defaults to output_callback.
         timeout: Maximum time in seconds to wait for the command to complete.
                  If None, the command runs indefinitely (e.g., for `log -f`).
+        limit: Buffer size of the pipe readers in bytes. Raise it for
+               high-volume streams so the reader holds more data between reads.
 
     Returns:
         The return code of the process.
@@ -97,11 +168,13 @@ async def run_streaming_command_async(command: list[str], output_callback: calla
     proc = None
     try:
         proc = await asyncio.create_subprocess_exec(
-            *command,
+            _resolve_executable(os.fsdecode(command[0])), *command[1:],
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+            stderr=asyncio.subprocess.PIPE,
+            limit=limit,
+            start_new_session=True
         )
-        _recent_output.append(f"[STREAM CMD] {' '.join(command)}")
+        _record_output(f"[STREAM CMD] {_command_text(command)}")
 
         # Create tasks to read stdout and stderr concurrently
         stdout_task = asyncio.create_task(_read_stream(proc.stdout, output_callback))
@@ -113,35 +186,43 @@ async def run_streaming_command_async(command: list[str], output_callback: calla
                 await asyncio.wait_for(proc.wait(), timeout=timeout)
             else:
                 await proc.wait()
-        except asyncio.TimeoutError:
-            if proc and proc.returncode is None:
-                proc.kill()
-                await proc.wait()
-            raise
-        except asyncio.CancelledError:
-            if proc and proc.returncode is None:
-                proc.kill()
-                await proc.wait()
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            await _kill_process_group(proc)
             raise
 
         await stdout_task
         await stderr_task
 
-        _recent_output.append(f"[STREAM RET] {proc.returncode}")
+        _record_output(f"[STREAM RET] {proc.returncode}")
         return proc.returncode
 
     except FileNotFoundError:
-        err_msg = f"Command not found: '{command[0]}'. Please ensure it's in your system's PATH."
+        err_msg = f"Command not found: '{os.fsdecode(command[0])}'. Please ensure it's in your system's PATH."
         if sys.platform != 'darwin':
             err_msg += " This application is designed for macOS and relies on macOS-specific tools."
         raise FileNotFoundError(err_msg)
+    except asyncio.TimeoutError:
+        raise asyncio.TimeoutError(f"Command '{_command_text(command)}' timed out after {timeout} seconds.")
     except Exception as e:
-        raise RuntimeError(f"An unexpected error occurred while running streaming command '{' '.join(command)}': {e}")
+        raise RuntimeError(f"An unexpected error occurred while running streaming command '{_command_text(command)}': {e}")
 
 def get_recent_output_logs() -> list[str]:
     """Returns a list of recent command outputs for debugging."""
     return list(_recent_output)
 
+def get_output_logs_since(position: int) -> tuple[list[str], int]:
+    """
+    Returns the recent-output entries recorded after `position`, and the
+    position to pass next time. Start with 0. Entries that have already
+    rotated out of the log are skipped.
+    """
+    total = _recent_output_count
+    retained = len(_recent_output)
+    new = min(total - position, retained)
+    if new <= 0:
+        return [], total
+    return list(itertools.islice(_recent_output, retained - new, None)), total
+
 # --- Test stub for async_subprocess.py (updated) ---
 if __name__ == '__main__':
     async def main_tests():
@@ -151,7 +232,9 @@ if __name__ == '__main__':
         print("\nTest 1: Successful command (ls -l /)")
         return_code, stdout, stderr = await run_command_async(['ls', '-l', '/'])
         print(f"Return Code: {return_code}")
-        print(f"STDOUT (first 5 lines):\n{os.linesep.join(stdout.splitlines()[:5])}...")
+        # Split off only the lines being previewed rather than the whole output.
+        preview_lines = stdout.split('\n', 5)[:5]
+        print(f"STDOUT (first 5 lines):\n{os.linesep.join(preview_lines)}...")
         print(f"STDERR:\n{stderr}")
         assert return_code == 0
         assert "Applications" in stdout
@@ -1,5 +1,6 @@
 # spotlight_gui/utils/checks.py
 import sys
+import functools
 import platform
 import os
 import importlib.util # For check_pyobjc_available
@@ -11,10 +12,14 @@ class SystemCheckError(Exception):
     """Custom exception for system check failures."""
     pass
 
+# The platform cannot change while the process runs, so evaluate it once.
+IS_MACOS = sys.platform == 'darwin'
+
 def is_macos() -> bool:
     """Checks if the current operating system is macOS."""
-    return sys.platform == 'darwin'
+    return IS_MACOS
 
+@functools.cache
 def get_macos_version() -> tuple[int, ...]:
     """
     Returns the macOS version as a tuple of integers (major, minor, patch).
@@ -36,22 +41,27 @@ def check_pyobjc_available() -> bool:
         return False # PyObjC is macOS-specific
     return importlib.util.find_spec("objc") is not None
 
+def _find_spec_safe(name: str) -> bool:
+    """Returns True if the module `name` can be located without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # find_spec raises ModuleNotFoundError when the parent package is missing.
+        return False
+
 def check_qt_available() -> str | None:
     """
     Checks if PyQt5 or PySide6 is installed and importable.
     Returns 'PyQt5', 'PySide6', or None.
     Prioritizes PySide6 if both are present (arbitrary choice, can be changed).
+
+    Uses importlib.util.find_spec so the Qt shared libraries are not loaded
+    just to detect the binding.
     """
-    try:
-        import PySide6.QtWidgets
+    if _find_spec_safe('PySide6.QtWidgets'):
         return 'PySide6'
-    except ImportError:
-        pass
-    try:
-        import PyQt5.QtWidgets
+    if _find_spec_safe('PyQt5.QtWidgets'):
         return 'PyQt5'
-    except ImportError:
-        pass
     return None
 
 def enforce_volume_protection_rule(volume_path: str) -> None:
@@ -65,6 +75,12 @@ def enforce_volume_protection_rule(volume_path: str) -> None:
     Raises:
         SystemCheckError: If the volume_path contains the forbidden name.
     """
+    # An absolute path can only refer to the protected volume if the name
+    # appears in it, so most paths are settled by one substring check.
+    # (Relative paths are resolved against the working directory first.)
+    if FORBIDDEN_VOLUME_NAME not in volume_path and os.path.isabs(volume_path):
+        return
+
     # Normalize path to handle /Volumes/Name, /private/var/folders/... etc.
     normalized_path = os.path.abspath(volume_path)
     
@@ -90,6 +106,23 @@ def enforce_volume_protection_rule(volume_path: str) -> None:
             f"'{FORBIDDEN_VOLUME_NAME}'. This volume cannot be modified or indexed by this application."
         )
 
+def enforce_volume_protection_rule_many(volume_paths) -> None:
+    """
+    Enforces the "B1 8TBPii" protection rule for several paths at once.
+
+    Args:
+        volume_paths: An iterable of paths being targeted.
+
+    Raises:
+        SystemCheckError: For the first path that refers to the protected volume.
+    """
+    paths = list(volume_paths)
+    # Fast path: no path mentions the protected name and all are absolute.
+    if not any(FORBIDDEN_VOLUME_NAME in path for path in paths) and all(map(os.path.isabs, paths)):
+        return
+    for path in paths:
+        enforce_volume_protection_rule(path)
+
 # Simple test stub for checks.py
 if __name__ == '__main__':
     print("--- Testing checks.py ---")
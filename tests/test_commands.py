@@ -1,7 +1,8 @@
 # spotlight_app/tests/test_commands.py
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, patch
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
 
 # Adjust sys.path to allow importing spotlight_gui as a package
 import sys
@@ -18,43 +19,164 @@ def mock_subprocess(mocker):
     mocker.patch('spotlight_gui.utils.async_subprocess.run_command_async', new=AsyncMock())
     mocker.patch('spotlight_gui.utils.async_subprocess.run_streaming_command_async', new=AsyncMock())
     mocker.patch('spotlight_gui.utils.async_subprocess.get_recent_output_logs', return_value=[]) # Mock logs too
+    # Keep mdfind on the (mocked) subprocess path even where the MDQuery API loads.
+    mocker.patch('spotlight_gui.core.api_mdquery.MDQUERY_AVAILABLE', False)
+
+@pytest.fixture(autouse=True)
+def clear_command_caches():
+    """Keeps cached statuses, path checks and shared mdfind results from leaking between tests."""
+    def _clear():
+        commands.invalidate_status_cache()
+        commands._status_locks.clear()
+        commands._mdfind_pending.clear()
+        commands._mdfind_finished_at.clear()
+        commands._check_path.cache_clear()
+    _clear()
+    yield
+    _clear()
 
 # Mock is_macos to control platform-specific test behavior
 @pytest.fixture
 def mock_is_macos(mocker):
-    """Fixture to mock is_macos to return True."""
-    mocker.patch('spotlight_gui.utils.checks.is_macos', return_value=True)
+    """Fixture to mock the macOS platform check to return True."""
+    mocker.patch('spotlight_gui.core.commands.IS_MACOS', True)
 
 @pytest.fixture
 def mock_not_macos(mocker):
-    """Fixture to mock is_macos to return False."""
-    mocker.patch('spotlight_gui.utils.checks.is_macos', return_value=False)
+    """Fixture to mock the macOS platform check to return False."""
+    mocker.patch('spotlight_gui.core.commands.IS_MACOS', False)
+
+def mock_volumes_scandir(mocker, names):
+    """Makes os.scandir('/Volumes') yield a directory entry for each name."""
+    entries = []
+    for index, name in enumerate(names):
+        entry = MagicMock()
+        entry.name = name
+        entry.path = f'/Volumes/{name}'
+        entry.is_dir.return_value = True
+        entry.stat.return_value.st_dev = -1 - index  # Each entry is its own mount
+        entries.append(entry)
+    scandir_mock = MagicMock()
+    scandir_mock.return_value.__enter__.return_value = iter(entries)
+    return mocker.patch('os.scandir', new=scandir_mock)
 
 # Helper function to configure the mock
 def configure_mock_run_command_async(mocker, return_code, stdout, stderr):
     mocker.patch('spotlight_gui.utils.async_subprocess.run_command_async', new=AsyncMock(return_value=(return_code, stdout, stderr)))
 
+def configure_mock_streaming_command_async(mocker, return_code, stdout_lines, stderr_lines=()):
+    """Replaces run_streaming_command_async with a fake that feeds the given lines to the callbacks."""
+    async def fake_streaming_command_async(cmd, cb, err_cb=None, timeout=None):
+        for line in stdout_lines:
+            await cb(line)
+        for line in stderr_lines:
+            await (err_cb or cb)(line)
+        return return_code
+    return mocker.patch('spotlight_gui.core.commands.run_streaming_command_async',
+                        new=AsyncMock(side_effect=fake_streaming_command_async))
+
 # --- Tests for mdfind ---
 @pytest.mark.asyncio
 async def test_mdfind_success_static(mock_subprocess, mocker):
-    configure_mock_run_command_async(mocker, 0, "path/to/file1.txt\npath/to/file2.txt", "")
+    stream_mock = configure_mock_streaming_command_async(mocker, 0, ["path/to/file1.txt", "", "path/to/file2.txt"])
     results = await commands.mdfind("test query")
     assert results == ["path/to/file1.txt", "path/to/file2.txt"]
-    commands.run_command_async.assert_called_once_with(["mdfind", "test query"])
+    assert stream_mock.call_args[0][0] == ["mdfind", "test query"]
+
+@pytest.mark.asyncio
+async def test_mdfind_static_uses_mdquery_when_available(mock_subprocess, mocker):
+    mocker.patch('spotlight_gui.core.api_mdquery.MDQUERY_AVAILABLE', True)
+    mdquery_mock = mocker.patch('spotlight_gui.core.api_mdquery.query_paths', return_value=["/a.txt"])
+    stream_mock = configure_mock_streaming_command_async(mocker, 0, ["/b.txt"])
+    results = await commands.mdfind('kMDItemFSName == "a.txt"', paths=["/Users"])
+    assert results == ["/a.txt"]
+    mdquery_mock.assert_called_once()
+    assert mdquery_mock.call_args[0][:3] == ('kMDItemFSName == "a.txt"', ["/Users"],
+                                             commands.async_subprocess.DEFAULT_TIMEOUT)
+    stream_mock.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_mdfind_static_cancel_stops_mdquery(mock_subprocess, mocker):
+    started = threading.Event()
+    stop_events = []
+
+    def fake_query(query, paths, timeout, stop):
+        stop_events.append(stop)
+        started.set()
+        stop.wait(5)
+        return None
+    mocker.patch('spotlight_gui.core.api_mdquery.MDQUERY_AVAILABLE', True)
+    mocker.patch('spotlight_gui.core.api_mdquery.query_paths', side_effect=fake_query)
+    task = asyncio.ensure_future(commands.mdfind('kMDItemFSName == "a.txt"'))
+    await asyncio.to_thread(started.wait, 5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert await asyncio.to_thread(stop_events[0].wait, 5)
+
+@pytest.mark.asyncio
+async def test_mdfind_static_falls_back_when_mdquery_rejects_query(mock_subprocess, mocker):
+    mocker.patch('spotlight_gui.core.api_mdquery.MDQUERY_AVAILABLE', True)
+    mocker.patch('spotlight_gui.core.api_mdquery.query_paths', return_value=None)
+    stream_mock = configure_mock_streaming_command_async(mocker, 0, ["/b.txt"])
+    assert await commands.mdfind("plain words") == ["/b.txt"]
+    stream_mock.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_mdfind_failure_static(mock_subprocess, mocker):
-    configure_mock_run_command_async(mocker, 1, "", "mdfind error")
+    stream_mock = configure_mock_streaming_command_async(mocker, 1, [], ["mdfind error"])
     with pytest.raises(commands.CommandError) as excinfo:
         await commands.mdfind("test query")
     assert "mdfind error" in str(excinfo.value)
-    commands.run_command_async.assert_called_once()
+    stream_mock.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_mdfind_with_paths(mock_subprocess, mocker):
-    configure_mock_run_command_async(mocker, 0, "path/to/file1.txt", "")
+    stream_mock = configure_mock_streaming_command_async(mocker, 0, ["path/to/file1.txt"])
     await commands.mdfind("test query", paths=["/path/to/dir"])
-    commands.run_command_async.assert_called_once_with(["mdfind", "test query", "-onlyin", "/path/to/dir"])
+    assert stream_mock.call_args[0][0] == ["mdfind", "test query", "-onlyin", "/path/to/dir"]
+
+def test_enforce_volume_protection_rule_many(monkeypatch, tmp_path):
+    from spotlight_gui.utils.checks import enforce_volume_protection_rule_many
+    enforce_volume_protection_rule_many(["/", "/Users/testuser", "/Volumes/MyDisk"])
+    with pytest.raises(SystemCheckError):
+        enforce_volume_protection_rule_many(["/", f"/Volumes/{FORBIDDEN_VOLUME_NAME}/docs"])
+    # Relative paths are resolved against the working directory.
+    forbidden_dir = tmp_path / FORBIDDEN_VOLUME_NAME
+    forbidden_dir.mkdir()
+    monkeypatch.chdir(forbidden_dir)
+    with pytest.raises(SystemCheckError):
+        enforce_volume_protection_rule_many(["/", "."])
+
+def test_check_path_caches_allowed_paths_only():
+    commands._check_path("/")
+    commands._check_path("/")
+    assert commands._check_path.cache_info().hits == 1
+    for _ in range(2):
+        with pytest.raises(SystemCheckError):
+            commands._check_path(f"/Volumes/{FORBIDDEN_VOLUME_NAME}")
+
+@pytest.mark.asyncio
+async def test_mdfind_identical_queries_share_one_process(mock_subprocess, mocker):
+    stream_mock = configure_mock_streaming_command_async(mocker, 0, ["path/to/file1.txt"])
+    first, second = await asyncio.gather(commands.mdfind("test query"), commands.mdfind("test query"))
+    assert first == second == ["path/to/file1.txt"]
+    assert first is not second
+    stream_mock.assert_called_once()
+
+    await commands.mdfind("other query")
+    assert stream_mock.call_count == 2
+
+    await asyncio.sleep(commands._MDFIND_COALESCE_WINDOW * 2)
+    await commands.mdfind("test query")
+    assert stream_mock.call_count == 3
+
+def test_mdfind_results_are_not_shared_across_loops(mock_subprocess, mocker):
+    stream_mock = configure_mock_streaming_command_async(mocker, 0, ["path/to/file1.txt"])
+    # Each asyncio.run() closes its loop within the coalescing window.
+    assert asyncio.run(commands.mdfind("test query")) == ["path/to/file1.txt"]
+    assert asyncio.run(commands.mdfind("test query")) == ["path/to/file1.txt"]
+    assert stream_mock.call_count == 2
 
 @pytest.mark.asyncio
 async def test_mdfind_live_streaming(mock_subprocess, mocker):
@@ -66,12 +188,12 @@ async def test_mdfind_live_streaming(mock_subprocess, mocker):
     # calls the callback for each line. For this test, we just check it's called.
     
     # Here's a more direct way to mock the streaming:
-    async def fake_streaming_command_async(cmd, cb, err_cb):
+    async def fake_streaming_command_async(cmd, cb):
         await cb("live_line_1")
         await cb("live_line_2")
         return 0
 
-    mocker.patch('spotlight_gui.utils.async_subprocess.run_streaming_command_async', new=fake_streaming_command_async)
+    mocker.patch('spotlight_gui.core.commands.run_streaming_command_async', new=AsyncMock(side_effect=fake_streaming_command_async))
 
     received_lines = []
     def sync_callback(line):
@@ -84,6 +206,45 @@ async def test_mdfind_live_streaming(mock_subprocess, mocker):
     commands.run_streaming_command_async.assert_called_once() # Now it's the patched fake_streaming_command_async
     assert commands.run_streaming_command_async.call_args[0][0] == ["mdfind", "live query", "-live"]
 
+@pytest.mark.asyncio
+async def test_mdfind_live_generator(mock_subprocess, mocker):
+    configure_mock_streaming_command_async(mocker, 0, ["live_line_1", "live_line_2", "live_line_3"])
+    results = await commands.mdfind("live query", live=True)
+    assert [line async for line in results] == ["live_line_1", "live_line_2", "live_line_3"]
+
+@pytest.mark.asyncio
+async def test_mdfind_stream_yields_batches(mock_subprocess, mocker):
+    stream_mock = configure_mock_streaming_command_async(mocker, 0, [f"path{i}" for i in range(5)])
+    batches = [batch async for batch in commands.mdfind_stream("live query", batch_size=2)]
+    assert batches == [["path0", "path1"], ["path2", "path3"], ["path4"]]
+    assert stream_mock.call_args[0][0] == ["mdfind", "live query", "-live"]
+
+@pytest.mark.asyncio
+async def test_mdfind_stream_close_waits_for_process_cleanup(mock_subprocess, mocker):
+    reaped = asyncio.Event()
+
+    async def endless_stream(cmd, cb, err_cb=None, timeout=None):
+        try:
+            while True:
+                await cb("/a.txt")
+                await asyncio.sleep(0)
+        finally:
+            reaped.set()
+
+    mocker.patch('spotlight_gui.core.commands.run_streaming_command_async', new=endless_stream)
+    stream = commands.mdfind_stream("live query")
+    assert await stream.__anext__() == ["/a.txt"]
+    await stream.aclose()
+    assert reaped.is_set()
+
+@pytest.mark.asyncio
+async def test_mdfind_live_bulk_callback(mock_subprocess, mocker):
+    configure_mock_streaming_command_async(mocker, 0, ["live_line_1", "live_line_2"])
+    received_batches = []
+    await commands.mdfind("live query", live=True, bulk_callback=received_batches.append)
+    # Lines arriving together are delivered as a single batch
+    assert received_batches == [["live_line_1", "live_line_2"]]
+
 
 @pytest.mark.asyncio
 async def test_mdfind_live_no_callback_raises_notimplemented(mock_subprocess):
@@ -181,9 +342,12 @@ async def test_mdls_success(mock_subprocess, mocker):
 	<string>Plain Text File</string>
 </dict>
 </plist>"""
-    configure_mock_run_command_async(mocker, 0, plist_output, "")
+    mocker.patch('os.path.exists', return_value=True)
+    run_mock = mocker.patch('spotlight_gui.core.commands.run_command_async',
+                            new=AsyncMock(return_value=(0, plist_output.encode('utf-8'), "")))
     metadata = await commands.mdls("/path/to/test_file.txt")
     assert metadata == {'kMDItemDisplayName': 'test_file.txt', 'kMDItemKind': 'Plain Text File'}
+    run_mock.assert_called_once_with(['mdls', '-plist', '-', "/path/to/test_file.txt"], text=False)
 
 @pytest.mark.asyncio
 async def test_mdls_file_not_found(mock_subprocess, mocker):
@@ -193,10 +357,88 @@ async def test_mdls_file_not_found(mock_subprocess, mocker):
 
 @pytest.mark.asyncio
 async def test_mdls_parse_error(mock_subprocess, mocker):
-    configure_mock_run_command_async(mocker, 0, "invalid plist data", "")
+    mocker.patch('os.path.exists', return_value=True)
+    mocker.patch('spotlight_gui.core.commands.run_command_async',
+                 new=AsyncMock(return_value=(0, b"invalid plist data", "")))
     with pytest.raises(commands.CommandError) as excinfo:
         await commands.mdls("/path/to/file.txt")
     assert "Failed to parse mdls plist output" in str(excinfo.value)
+    assert excinfo.value.stdout == "invalid plist data"
+
+@pytest.mark.asyncio
+async def test_mdls_many_single_process(mock_subprocess, mocker):
+    import plistlib
+    mocker.patch('os.path.exists', side_effect=lambda p: p != "/missing.txt")
+    stdout = (plistlib.dumps({'kMDItemDisplayName': 'a.txt'}) +
+              plistlib.dumps({'kMDItemDisplayName': 'b.txt'}))
+    run_mock = mocker.patch('spotlight_gui.core.commands.run_command_async',
+                            new=AsyncMock(return_value=(0, stdout, "")))
+    metadata = await commands.mdls_many(["/a.txt", "/missing.txt", "/b.txt"])
+    assert metadata == {"/a.txt": {'kMDItemDisplayName': 'a.txt'},
+                        "/missing.txt": {},
+                        "/b.txt": {'kMDItemDisplayName': 'b.txt'}}
+    run_mock.assert_called_once_with(['mdls', '-plist', '-', "/a.txt", "/b.txt"], text=False)
+
+@pytest.mark.asyncio
+async def test_mdls_many_record_count_mismatch_raises(mock_subprocess, mocker):
+    import plistlib
+    mocker.patch('os.path.exists', return_value=True)
+    mocker.patch('spotlight_gui.core.commands.run_command_async',
+                 new=AsyncMock(return_value=(0, plistlib.dumps({'kMDItemDisplayName': 'a.txt'}), "")))
+    with pytest.raises(commands.CommandError):
+        await commands.mdls_many(["/a.txt", "/b.txt"])
+
+@pytest.mark.asyncio
+async def test_mdls_selected_attrs_uses_raw_output(mock_subprocess, mocker):
+    mocker.patch('os.path.exists', return_value=True)
+    run_mock = mocker.patch('spotlight_gui.core.commands.run_command_async',
+                            new=AsyncMock(return_value=(0, b"test_file.txt\0(null)\0Plain Text File", "")))
+    metadata = await commands.mdls("/path/to/test_file.txt",
+                                   attrs=['kMDItemDisplayName', 'kMDItemAuthors', 'kMDItemKind'])
+    assert metadata == {'kMDItemDisplayName': 'test_file.txt', 'kMDItemAuthors': None,
+                        'kMDItemKind': 'Plain Text File'}
+    run_mock.assert_called_once_with(['mdls', '-raw', '-name', 'kMDItemDisplayName', '-name', 'kMDItemAuthors',
+                                      '-name', 'kMDItemKind', '/path/to/test_file.txt'], text=False)
+
+@pytest.mark.asyncio
+async def test_mdls_fields_keeps_types_and_fills_missing(mock_subprocess, mocker):
+    import plistlib
+    mocker.patch('os.path.exists', return_value=True)
+    run_mock = mocker.patch('spotlight_gui.core.commands.run_command_async',
+                            new=AsyncMock(return_value=(0, plistlib.dumps({'kMDItemFSSize': 1024}), "")))
+    metadata = await commands.mdls_fields("/path/to/test_file.txt", ['kMDItemFSSize', 'kMDItemAuthors'])
+    assert metadata == {'kMDItemFSSize': 1024, 'kMDItemAuthors': None}
+    run_mock.assert_called_once_with(['mdls', '-name', 'kMDItemFSSize', '-name', 'kMDItemAuthors',
+                                      '-plist', '-', '/path/to/test_file.txt'], text=False)
+
+@pytest.mark.parametrize("use_lxml", [True, False])
+def test_parse_plist_matches_plistlib(mocker, use_lxml):
+    import datetime
+    import plistlib
+    if not use_lxml:
+        mocker.patch('spotlight_gui.core.commands._lxml_etree', None)
+    elif commands._lxml_etree is None:
+        pytest.skip("lxml is not installed")
+    value = {
+        'kMDItemDisplayName': 'test_file.txt',
+        'kMDItemFSSize': 1024,
+        'kMDItemDurationSeconds': 12.5,
+        'kMDItemIsScreenCapture': False,
+        'kMDItemContentCreationDate': datetime.datetime(2024, 1, 2, 3, 4, 5),
+        'kMDItemContentTypeTree': ['public.plain-text', 'public.text'],
+        'kMDItemBinary': b'\x00\x01',
+        'kMDItemEmpty': '',
+    }
+    assert commands._parse_plist(plistlib.dumps(value)) == value
+
+def test_parse_plist_binary():
+    import plistlib
+    value = {'kMDItemDisplayName': 'test_file.txt', 'kMDItemFSSize': 1024}
+    assert commands._parse_plist(plistlib.dumps(value, fmt=plistlib.FMT_BINARY)) == value
+
+def test_parse_plist_invalid_data_raises_valueerror():
+    with pytest.raises(ValueError):
+        commands._parse_plist(b"invalid plist data")
 
 # --- Tests for log_show ---
 @pytest.mark.asyncio
@@ -217,12 +459,12 @@ async def test_log_show_non_streaming_failure(mock_subprocess, mocker):
 async def test_log_show_streaming(mock_subprocess, mocker):
     mock_callback = AsyncMock()
 
-    async def fake_streaming_log_command(cmd, cb, err_cb):
+    async def fake_streaming_log_command(cmd, cb, limit=None):
         await cb("streamed log 1")
         await cb("streamed log 2")
         return 0
 
-    mocker.patch('spotlight_gui.utils.async_subprocess.run_streaming_command_async', new=fake_streaming_log_command)
+    mocker.patch('spotlight_gui.core.commands.run_streaming_command_async', new=AsyncMock(side_effect=fake_streaming_log_command))
 
     received_logs = []
     def sync_callback(line):
@@ -233,6 +475,138 @@ async def test_log_show_streaming(mock_subprocess, mocker):
     assert received_logs == ["streamed log 1", "streamed log 2"]
     commands.run_streaming_command_async.assert_called_once()
     assert commands.run_streaming_command_async.call_args[0][0] == ["log", "show", "--predicate", "predicate_string", "--stream"]
+    assert commands.run_streaming_command_async.call_args.kwargs['limit'] == commands._LOG_STREAM_LIMIT
+
+@pytest.mark.asyncio
+async def test_log_show_json_streaming_yields_dicts(mock_subprocess, mocker):
+    async def fake_streaming_log_command(cmd, cb, limit=None):
+        await cb('Filtering the log data using "predicate_string"')
+        await cb('{"eventMessage": "one", "processID": 1}')
+        await cb('{"eventMessage": "two", "processID": 2}')
+        return 0
+
+    mocker.patch('spotlight_gui.core.commands.run_streaming_command_async', new=AsyncMock(side_effect=fake_streaming_log_command))
+    batches = []
+    await commands.log_show("predicate_string", tail=True, bulk_callback=batches.append, style='json')
+
+    assert batches == [[{"eventMessage": "one", "processID": 1}, {"eventMessage": "two", "processID": 2}]]
+    assert commands.run_streaming_command_async.call_args[0][0] == ["log", "show", "--predicate", "predicate_string",
+                                                                    "--stream", "--style", "ndjson"]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_orjson", [True, False])
+async def test_log_show_json_non_streaming(mock_subprocess, mocker, use_orjson):
+    if not use_orjson:
+        mocker.patch('spotlight_gui.core.commands._json_fast', None)
+    run_mock = mocker.patch('spotlight_gui.core.commands.run_command_async',
+                            new=AsyncMock(return_value=(0, '{"eventMessage": "one"}\n{"count": 1, "finished": 1}', "")))
+    logs = await commands.log_show("predicate_string", style='json')
+    assert logs == [{"eventMessage": "one"}, {"count": 1, "finished": 1}]
+    run_mock.assert_called_once_with(
+        ["log", "show", "--predicate", "predicate_string", "--last", "1h", "--style", "ndjson"], timeout=120)
+
+@pytest.mark.asyncio
+async def test_log_show_json_rejects_persistent(mock_subprocess):
+    with pytest.raises(ValueError):
+        await commands.log_show("predicate_string", persistent=True, style='json')
+
+@pytest.mark.asyncio
+async def test_line_batcher_flushes_by_size_and_on_demand():
+    batches = []
+    batcher = commands._LineBatcher(batches.append, max_lines=2, max_delay=60)
+    for line in ["a", "", "b", "c"]:
+        await batcher.add(line)
+    assert batches == [["a", "b"]]
+    await batcher.flush()
+    assert batches == [["a", "b"], ["c"]]
+
+@pytest.mark.asyncio
+async def test_line_batcher_callback_dispatch(mocker):
+    to_thread_spy = mocker.spy(asyncio, 'to_thread')
+
+    inline_batches = []
+    batcher = commands._LineBatcher(inline_batches.append)
+    await batcher.add("inline")
+    await batcher.flush()
+    assert inline_batches == [["inline"]]
+    to_thread_spy.assert_not_called()
+
+    async_callback = AsyncMock()
+    batcher = commands._LineBatcher(async_callback)
+    await batcher.add("awaited")
+    await batcher.flush()
+    async_callback.assert_awaited_once_with(["awaited"])
+
+    threaded_batches = []
+    batcher = commands._LineBatcher(threaded_batches.append, blocking=True)
+    await batcher.add("threaded")
+    await batcher.flush()
+    assert threaded_batches == [["threaded"]]
+    to_thread_spy.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_line_batcher_flushes_after_delay():
+    batches = []
+    batcher = commands._LineBatcher(batches.append, max_lines=100, max_delay=0.01)
+    await batcher.add("only line")
+    await asyncio.sleep(0.1)
+    assert batches == [["only line"]]
+
+@pytest.mark.asyncio
+async def test_log_show_iter_yields_entries(mock_subprocess, mocker):
+    async def fake_stream(cmd, cb, limit=None):
+        await cb("log line 1")
+        await cb("log line 2")
+        return 0
+    stream_mock = mocker.patch('spotlight_gui.core.commands.run_streaming_command_async',
+                               new=AsyncMock(side_effect=fake_stream))
+    entries = [line async for line in commands.log_show_iter("predicate_string")]
+    assert entries == ["log line 1", "log line 2"]
+    assert stream_mock.call_args[0][0] == ["log", "show", "--predicate", "predicate_string", "--last", "1h"]
+
+@pytest.mark.asyncio
+async def test_log_show_iter_failure_raises(mock_subprocess, mocker):
+    mocker.patch('spotlight_gui.core.commands.run_streaming_command_async',
+                 new=AsyncMock(return_value=1))
+    with pytest.raises(commands.CommandError):
+        [line async for line in commands.log_show_iter("predicate_string")]
+
+@pytest.mark.asyncio
+async def test_log_tail_service_serves_repeat_queries_from_stream(mock_subprocess, mocker):
+    run_mock = mocker.patch('spotlight_gui.core.commands.run_command_async',
+                            new=AsyncMock(return_value=(0, "archived 1\narchived 2", "")))
+    stream_started = asyncio.Event()
+
+    async def fake_stream(cmd, cb, limit=None):
+        await cb("streamed 1")
+        stream_started.set()
+        await asyncio.Event().wait()  # Runs until cancelled
+    stream_mock = mocker.patch('spotlight_gui.core.commands.run_streaming_command_async',
+                               new=AsyncMock(side_effect=fake_stream))
+
+    service = commands.LogTailService()
+    try:
+        first = await service.recent("predicate_string")
+        await stream_started.wait()
+        second = await service.recent("predicate_string")
+    finally:
+        service.stop()
+
+    assert first[:2] == ["archived 1", "archived 2"]
+    assert second == ["archived 1", "archived 2", "streamed 1"]
+    run_mock.assert_called_once_with(["log", "show", "--predicate", "predicate_string", "--last", "1h"], timeout=120)
+    stream_mock.assert_called_once()
+    assert stream_mock.call_args[0][0] == ["log", "show", "--predicate", "predicate_string", "--stream"]
+
+@pytest.mark.asyncio
+async def test_log_tail_service_returns_history_when_stream_already_exited(mock_subprocess, mocker):
+    mocker.patch('spotlight_gui.core.commands.run_command_async',
+                 new=AsyncMock(return_value=(0, "archived 1", "")))
+    mocker.patch('spotlight_gui.core.commands.run_streaming_command_async',
+                 new=AsyncMock(return_value=0))  # `log show --stream` exits at once
+
+    service = commands.LogTailService()
+    assert await service.recent("predicate_string") == ["archived 1"]
 
 @pytest.mark.asyncio
 async def test_log_show_streaming_no_callback_raises_notimplemented(mock_subprocess):
@@ -242,29 +616,19 @@ async def test_log_show_streaming_no_callback_raises_notimplemented(mock_subproc
 # --- Tests for list_indexed_volumes ---
 @pytest.mark.asyncio
 async def test_list_indexed_volumes_on_macos(mock_subprocess, mocker, mock_is_macos):
-    # Mock os.listdir('/Volumes')
-    mocker.patch('os.path.exists', side_effect=lambda p: p == '/Volumes')
-    mocker.patch('os.listdir', return_value=['Macintosh HD', 'ExternalDrive', FORBIDDEN_VOLUME_NAME])
-    mocker.patch('os.path.isdir', return_value=True) # Assume all listed are directories
-
-    # Configure mdutil_status mocks for each volume (mock the internal call)
-    mdutil_status_mock = AsyncMock()
-    mdutil_status_mock.side_effect = [
-        {'volume': '/', 'indexed': True, 'state': 'enabled'}, # for /
-        {'volume': '/Volumes/ExternalDrive', 'indexed': True, 'state': 'enabled'}, # for /Volumes/ExternalDrive
-        {'volume': '/Volumes/Macintosh HD', 'indexed': False, 'state': 'disabled'} # for /Volumes/Macintosh HD
-        # FORBIDDEN_VOLUME_NAME will raise SystemCheckError internally, which is caught by list_indexed_volumes
-    ]
-    mocker.patch('spotlight_gui.core.commands.mdutil_status', new=mdutil_status_mock)
-
-    # Mock the internal enforce_volume_protection_rule
-    mocker.patch('spotlight_gui.utils.checks.enforce_volume_protection_rule', side_effect=lambda path:
-        _raise_forbidden_error(path) if FORBIDDEN_VOLUME_NAME in path else None
+    # Mock os.scandir('/Volumes'); all entries are directories
+    mock_volumes_scandir(mocker, ['Macintosh HD', 'ExternalDrive', FORBIDDEN_VOLUME_NAME])
+
+    # All allowed volumes are queried with a single batched `mdutil -s` call.
+    # The forbidden volume is filtered out before mdutil runs.
+    mdutil_output = (
+        "/:\n\tIndexing enabled. \n"
+        "/Volumes/ExternalDrive:\n\tIndexing enabled. \n"
+        "/Volumes/Macintosh HD:\n\tIndexing disabled. \n"
     )
-
-    def _raise_forbidden_error(path):
-        if FORBIDDEN_VOLUME_NAME in path:
-            raise SystemCheckError(f"Operation aborted: Target volume '{FORBIDDEN_VOLUME_NAME}' is protected.")
+    run_mock = mocker.patch('spotlight_gui.core.commands.run_command_async',
+                            new=AsyncMock(return_value=(0, mdutil_output, "")))
+    mdutil_status_mock = mocker.patch('spotlight_gui.core.commands.mdutil_status', new=AsyncMock())
 
     volumes = await commands.list_indexed_volumes()
 
@@ -273,13 +637,51 @@ async def test_list_indexed_volumes_on_macos(mock_subprocess, mocker, mock_is_ma
     expected_volumes = sorted([
         {'volume': '/', 'indexed': True, 'state': 'enabled'},
         {'volume': '/Volumes/ExternalDrive', 'indexed': True, 'state': 'enabled'},
-        {'volume': f'/Volumes/{FORBIDDEN_VOLUME_NAME}', 'indexed': 'restricted', 'state': 'restricted', 'error': f"Operation aborted: Target volume '{FORBIDDEN_VOLUME_NAME}' is protected."},
+        {'volume': f'/Volumes/{FORBIDDEN_VOLUME_NAME}', 'indexed': 'restricted', 'state': 'restricted', 'error': f"Operation aborted: Target volume '{FORBIDDEN_VOLUME_NAME}' is protected due to a critical system safety rule. This volume cannot be modified or indexed by this application."},
         {'volume': '/Volumes/Macintosh HD', 'indexed': False, 'state': 'disabled'}
     ], key=lambda x: x['volume'])
-    
+
     assert volumes == expected_volumes
-    assert mdutil_status_mock.call_count == 3 # Should be called for /, ExternalDrive, Macintosh HD. Forbidden one skips mdutil_status.
+    run_mock.assert_called_once_with(['mdutil', '-s', '/', '/Volumes/ExternalDrive', '/Volumes/Macintosh HD'])
+    mdutil_status_mock.assert_not_called()
 
+    # A refresh within the cache TTL is served without running mdutil again.
+    mock_volumes_scandir(mocker, ['Macintosh HD', 'ExternalDrive', FORBIDDEN_VOLUME_NAME])
+    assert await commands.list_indexed_volumes() == expected_volumes
+    run_mock.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_list_indexed_volumes_skips_non_mount_directories(mock_subprocess, mocker, mock_is_macos):
+    scandir_mock = mock_volumes_scandir(mocker, ['ExternalDrive', 'LeftoverFolder'])
+    entries = list(scandir_mock.return_value.__enter__.return_value)
+    scandir_mock.return_value.__enter__.return_value = iter(entries)
+    # LeftoverFolder is a plain directory on the root filesystem, not a mount.
+    entries[1].stat.return_value.st_dev = os.stat('/').st_dev
+    run_mock = mocker.patch('spotlight_gui.core.commands.run_command_async',
+                            new=AsyncMock(return_value=(0, "/: Indexing enabled.\n/Volumes/ExternalDrive: Indexing enabled.", "")))
+
+    volumes = await commands.list_indexed_volumes()
+
+    assert [v['volume'] for v in volumes] == ['/', '/Volumes/ExternalDrive']
+    run_mock.assert_called_once_with(['mdutil', '-s', '/', '/Volumes/ExternalDrive'])
+
+@pytest.mark.asyncio
+async def test_mdutil_status_bulk_queries_only_uncached_volumes(mock_subprocess, mocker):
+    run_mock = mocker.patch('spotlight_gui.core.commands.run_command_async',
+                            new=AsyncMock(return_value=(0, "/Volumes/A: Indexing enabled.", "")))
+    await commands.mdutil_status_bulk(['/Volumes/A'])
+    run_mock.return_value = (0, "/Volumes/B:\n\tIndexing disabled.\n", "")
+
+    statuses = await commands.mdutil_status_bulk(['/Volumes/A', '/Volumes/B'])
+
+    assert statuses == {'/Volumes/A': {'volume': '/Volumes/A', 'indexed': True, 'state': 'enabled'},
+                        '/Volumes/B': {'volume': '/Volumes/B', 'indexed': False, 'state': 'disabled'}}
+    run_mock.assert_called_with(['mdutil', '-s', '/Volumes/B'])
+    assert run_mock.call_count == 2
+    # The bulk results feed the per-volume cache used by mdutil_status().
+    assert await commands.mdutil_status('/Volumes/B') == statuses['/Volumes/B']
+    assert run_mock.call_count == 2
 
 @pytest.mark.asyncio
 async def test_list_indexed_volumes_on_non_macos(mock_subprocess, mock_not_macos):
@@ -290,15 +692,16 @@ async def test_list_indexed_volumes_on_non_macos(mock_subprocess, mock_not_macos
 
 @pytest.mark.asyncio
 async def test_list_indexed_volumes_mdutil_status_fails_for_one_volume(mock_subprocess, mocker, mock_is_macos):
-    mocker.patch('os.path.exists', side_effect=lambda p: p == '/Volumes')
-    mocker.patch('os.listdir', return_value=['MyGoodDisk', 'MyBadDisk'])
-    mocker.patch('os.path.isdir', return_value=True)
+    mock_volumes_scandir(mocker, ['MyGoodDisk', 'MyBadDisk'])
 
+    # The batched call fails, so each volume is queried on its own.
+    mocker.patch('spotlight_gui.core.commands.run_command_async',
+                 new=AsyncMock(return_value=(1, "", "/Volumes/MyBadDisk: No such disk")))
     mdutil_status_mock = AsyncMock()
     mdutil_status_mock.side_effect = [
         {'volume': '/', 'indexed': True, 'state': 'enabled'},
+        commands.CommandError("Failed for bad disk", stderr="No such disk"), # For /Volumes/MyBadDisk
         {'volume': '/Volumes/MyGoodDisk', 'indexed': True, 'state': 'enabled'},
-        commands.CommandError("Failed for bad disk", stderr="No such disk") # For /Volumes/MyBadDisk
     ]
     mocker.patch('spotlight_gui.core.commands.mdutil_status', new=mdutil_status_mock)
 
@@ -311,4 +714,71 @@ async def test_list_indexed_volumes_mdutil_status_fails_for_one_volume(mock_subp
     ], key=lambda x: x['volume'])
 
     assert volumes == expected_volumes
-    assert mdutil_status_mock.call_count == 3 # For /, MyGoodDisk, MyBadDisk (the mock will raise CommandError)
\ No newline at end of file
+    assert mdutil_status_mock.call_count == 3 # For /, MyBadDisk, MyGoodDisk (the mock will raise CommandError)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_orjson", [True, False])
+async def test_list_indexed_volumes_json(mocker, use_orjson):
+    import json
+    if not use_orjson:
+        mocker.patch('spotlight_gui.core.commands._json_fast', None)
+    elif commands._json_fast is None:
+        pytest.skip("orjson is not installed")
+    volumes = [{'volume': '/', 'indexed': True, 'state': 'enabled'},
+               {'volume': '/Volumes/Disk', 'indexed': 'error', 'state': 'error', 'error': 'Failed'}]
+    mocker.patch('spotlight_gui.core.commands.list_indexed_volumes', new=AsyncMock(return_value=volumes))
+    payload = await commands.list_indexed_volumes_json()
+    assert isinstance(payload, bytes)
+    assert json.loads(payload) == volumes
+
+@pytest.mark.asyncio
+async def test_mdutil_status_is_cached(mock_subprocess, mocker):
+    run_mock = mocker.patch('spotlight_gui.core.commands.run_command_async',
+                            new=AsyncMock(return_value=(0, "/Volumes/MyDisk: Indexing enabled.", "")))
+    first, second = await asyncio.gather(commands.mdutil_status("/Volumes/MyDisk"),
+                                         commands.mdutil_status("/Volumes/MyDisk"))
+    third = await commands.mdutil_status("/Volumes/MyDisk")
+    assert first == second == third == {'volume': '/Volumes/MyDisk', 'indexed': True, 'state': 'enabled'}
+    run_mock.assert_called_once()
+    # Cache hits share one read-only object
+    assert first is third
+    with pytest.raises(TypeError):
+        third['state'] = 'disabled'
+
+    await commands.mdutil_status("/Volumes/MyDisk", force=True)
+    assert run_mock.call_count == 2
+
+    mocker.patch('spotlight_gui.core.commands.time.monotonic',
+                 return_value=commands.time.monotonic() + commands._STATUS_CACHE_TTL + 1)
+    await commands.mdutil_status("/Volumes/MyDisk")
+    assert run_mock.call_count == 3
+
+@pytest.mark.asyncio
+async def test_mdutil_manage_index_invalidates_status_cache(mock_subprocess, mocker):
+    run_mock = mocker.patch('spotlight_gui.core.commands.run_command_async',
+                            new=AsyncMock(return_value=(0, "/Volumes/MyDisk: Indexing enabled.", "")))
+    await commands.mdutil_status("/Volumes/MyDisk")
+    await commands.mdutil_manage_index("/Volumes/MyDisk", "disable")
+    run_mock.return_value = (0, "/Volumes/MyDisk: Indexing disabled.", "")
+    status = await commands.mdutil_status("/Volumes/MyDisk")
+    assert status['state'] == 'disabled'
+
+@pytest.mark.asyncio
+async def test_mdutil_status_multiline_output(mock_subprocess, mocker):
+    mocker.patch('spotlight_gui.core.commands.run_command_async',
+                 new=AsyncMock(return_value=(0, "/Volumes/MyDisk:\n\tIndexing enabled. ", "")))
+    status = await commands.mdutil_status("/Volumes/MyDisk")
+    assert status == {'volume': '/Volumes/MyDisk', 'indexed': True, 'state': 'enabled'}
+
+def test_get_output_logs_since_returns_only_new_entries(mocker):
+    from spotlight_gui.utils import async_subprocess
+    mocker.patch.object(async_subprocess, '_recent_output', async_subprocess.collections.deque(maxlen=3))
+    mocker.patch.object(async_subprocess, '_recent_output_count', 0)
+    async_subprocess._record_output("a")
+    entries, position = async_subprocess.get_output_logs_since(0)
+    assert entries == ["a"]
+    for entry in ("b", "c", "d", "e"):
+        async_subprocess._record_output(entry)
+    # Entries that rotated out of the bounded log are skipped.
+    assert async_subprocess.get_output_logs_since(position) == (["c", "d", "e"], 5)
+    assert async_subprocess.get_output_logs_since(5) == ([], 5)